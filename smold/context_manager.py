@@ -4,10 +4,23 @@ Manages conversation history and token counting to maintain context within limit
 """
 
 import tiktoken
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from collections import deque
 
 
+# The system prompt and recent messages are counted again on every
+# add_interaction/get_context_info call, so remember recent results
+@lru_cache(maxsize=256)
+def count_text_tokens(encoding_name: str, text: str) -> int:
+    """Return the number of tokens in `text` under the named tiktoken encoding.
+
+    Special tokens such as <|endoftext|> are counted as plain text. This is
+    shared with council.py, so both count the same text the same way.
+    """
+    return len(tiktoken.get_encoding(encoding_name).encode_ordinary(text))
+
+
 class ConversationHistory:
     """Manages conversation history with token counting and size limits."""
     
@@ -37,7 +50,7 @@ class ConversationHistory:
     def count_tokens(self, text: str) -> int:
         """Count tokens in the given text using tiktoken."""
         try:
-            return len(self.tokenizer.encode(text))
+            return count_text_tokens(self.tokenizer.name, text)
         except Exception as e:
             print(f"WARNING: Tiktoken fallback active! Token counting may be inaccurate. Error: {e}")
             return len(text) // 4  # Rough fallback estimate
@@ -42,7 +42,7 @@ except Exception as e:
 # Third-party imports
 try:
     import tiktoken
-    from openai import OpenAI
+    from openai import AsyncOpenAI, OpenAI
     from google import genai
     from google.genai import types
 except ImportError as e:
@@ -51,6 +51,16 @@ except ImportError as e:
     print("pip install openai google-genai tiktoken")
     sys.exit(1)
 
+# Shared with the agent's context manager; as a script, smold/ itself is on the path
+try:
+    from smold.context_manager import count_text_tokens
+except ImportError:
+    from context_manager import count_text_tokens
+
+
+# Below this much message text, encoding the strings one by one beats starting threads
+BATCH_ENCODE_MIN_CHARS = 64 * 1024
+
 
 class CouncilConsultation:
     """Council of AI Specialists for superior advice consultation."""
@@ -61,6 +71,8 @@ class CouncilConsultation:
         self.openai_client = None
         self.gemini_client = None
         self.deepseek_client = None
+        self.openai_async_client = None
+        self.deepseek_async_client = None
         # Use encoding_for_model for better model alignment
         # gpt-5-mini uses the same encoding as gpt-4o-mini (o200k_base)
         try:
@@ -73,20 +85,22 @@ class CouncilConsultation:
     def initialize_clients(self):
         """Initialize API clients with proper error handling."""
         try:
-            # Initialize OpenAI client
+            # Check the OpenAI key; the blocking clients are built on first use by the call_* methods
             if not os.environ.get("OPENAI_API_KEY"):
                 raise ValueError("OPENAI_API_KEY environment variable not set")
-            self.openai_client = OpenAI()
 
-            # Initialize Gemini client
+            # Initialize Gemini client, whose .aio serves run_async_consultation
             if not os.environ.get("GEMINI_API_KEY"):
                 raise ValueError("GEMINI_API_KEY environment variable not set")
             self.gemini_client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
 
-            # Initialize DeepSeek client
+            # Check the DeepSeek key
             if not os.environ.get("DEEPSEEK_API_KEY"):
                 raise ValueError("DEEPSEEK_API_KEY environment variable not set")
-            self.deepseek_client = OpenAI(
+
+            # Async clients for run_async_consultation
+            self.openai_async_client = AsyncOpenAI()
+            self.deepseek_async_client = AsyncOpenAI(
                 api_key=os.environ.get("DEEPSEEK_API_KEY"),
                 base_url="https://api.deepseek.com"
             )
@@ -120,8 +134,10 @@ class CouncilConsultation:
 
     def count_tokens(self, text: str) -> int:
         """Count tokens in the given text using tiktoken."""
+        if not text:
+            return 0
         try:
-            return len(self.tokenizer.encode(text))
+            return count_text_tokens(self.tokenizer.name, text)
         except Exception as e:
             print(f"Error counting tokens: {e}")
             return 0
@@ -141,19 +157,31 @@ class CouncilConsultation:
         tokens_per_message = 3
         tokens_per_name = 1
 
+        # Collect every string first so they can be encoded together
         total = 0
+        strings = []
         for msg in messages:
             total += tokens_per_message
             for k, v in msg.items():
+                # Empty strings encode to no tokens, so they are left out
                 if isinstance(v, str):
-                    total += len(encoding.encode(v))
+                    if v:
+                        strings.append(v)
                 elif isinstance(v, list):
                     # Handle content arrays (like in gpt-5-mini format)
                     for item in v:
-                        if isinstance(item, dict) and 'text' in item:
-                            total += len(encoding.encode(item['text']))
+                        if isinstance(item, dict) and item.get('text'):
+                            strings.append(item['text'])
                 if k == "name":
                     total += tokens_per_name
+
+        # encode_ordinary_batch spreads the strings over a thread pool (the encoder
+        # releases the GIL); that only pays off once there is enough text to share
+        if len(strings) > 1 and sum(map(len, strings)) >= BATCH_ENCODE_MIN_CHARS:
+            encoded = encoding.encode_ordinary_batch(strings, num_threads=min(len(strings), os.cpu_count() or 1))
+            total += sum(map(len, encoded))
+        else:
+            total += sum(count_text_tokens(encoding.name, s) for s in strings)
         total += 3  # assistant reply preamble
         return total
 
@@ -206,98 +234,122 @@ Be thorough, precise, and actionable in your recommendations.
 
         return full_content
 
-    def call_openai_o3(self, content: str) -> str:
-        """Make API call to OpenAI gpt-5-mini."""
-        try:
-            print("[AI] Consulting OpenAI gpt-5-mini...")
-
-            response = self.openai_client.responses.create(
-                model="gpt-5-mini-2025-08-07",
-                input=[
-                    {
-                        "role": "developer",
-                        "content": [
-                            {
-                                "type": "input_text",
-                                "text": f"""Act as a senior software engineer and technical architect.
+    def _openai_request(self, content: str) -> dict:
+        """Build the keyword arguments for the gpt-5-mini Responses API call."""
+        return dict(
+            model="gpt-5-mini-2025-08-07",
+            input=[
+                {
+                    "role": "developer",
+                    "content": [
+                        {
+                            "type": "input_text",
+                            "text": f"""Act as a senior software engineer and technical architect.
 
 You are part of an elite council of AI specialists providing superior advice to a code agent.
 Your role is to provide expert technical guidance, architectural insights, and best practices.
 Be thorough, precise, and actionable in your recommendations.
 
 {content}"""
-                            }
-                        ]
-                    }
-                ],
-                text={
-                    "format": {
-                        "type": "text"
-                    }
-                },
-                reasoning={
-                    "effort": "medium"
-                },
-                tools=[],
-                store=True
-            )
+                        }
+                    ]
+                }
+            ],
+            text={
+                "format": {
+                    "type": "text"
+                }
+            },
+            reasoning={
+                "effort": "medium"
+            },
+            tools=[],
+            store=True
+        )
+
+    def _openai_response_text(self, response) -> str:
+        """Extract the text of a gpt-5-mini response."""
+        # Extract the actual response content using output_text
+        if hasattr(response, 'output_text') and response.output_text:
+            return response.output_text
+        elif hasattr(response, 'output') and response.output:
+            # Fallback: extract from output array
+            text_parts = []
+            for item in response.output:
+                if hasattr(item, 'content') and item.content:
+                    text_parts.append(item.content)
+            return '\n'.join(text_parts) if text_parts else "No content in output"
+        else:
+            return f"Unable to extract response content. Status: {getattr(response, 'status', 'unknown')}"
+
+    def call_openai_o3(self, content: str) -> str:
+        """Make API call to OpenAI gpt-5-mini."""
+        try:
+            print("[AI] Consulting OpenAI gpt-5-mini...")
 
-            # Extract the actual response content using output_text
-            if hasattr(response, 'output_text') and response.output_text:
-                return response.output_text
-            elif hasattr(response, 'output') and response.output:
-                # Fallback: extract from output array
-                text_parts = []
-                for item in response.output:
-                    if hasattr(item, 'content') and item.content:
-                        text_parts.append(item.content)
-                return '\n'.join(text_parts) if text_parts else "No content in output"
-            else:
-                return f"Unable to extract response content. Status: {getattr(response, 'status', 'unknown')}"
+            if self.openai_client is None:
+                self.openai_client = OpenAI()
+            response = self.openai_client.responses.create(**self._openai_request(content))
+            return self._openai_response_text(response)
 
         except Exception as e:
             return f"Error calling OpenAI gpt-5-mini: {str(e)}"
 
-    def call_gemini_pro(self, content: str) -> str:
-        """Make API call to Gemini 3 Flash."""
+    async def acall_openai_o3(self, content: str) -> str:
+        """Make async API call to OpenAI gpt-5-mini."""
         try:
-            print("[GEMINI] Consulting Gemini 3 Flash...")
+            print("[AI] Consulting OpenAI gpt-5-mini...")
+
+            response = await self.openai_async_client.responses.create(**self._openai_request(content))
+            return self._openai_response_text(response)
+
+        except Exception as e:
+            return f"Error calling OpenAI gpt-5-mini: {str(e)}"
+
+    def _gemini_request(self, content: str) -> dict:
+        """Build the keyword arguments for the Gemini 3 Flash streaming call."""
+        model = "gemini-3-flash-preview"
+        contents = [
+            types.Content(
+                role="user",
+                parts=[
+                    types.Part.from_text(text=content),
+                ],
+            ),
+        ]
+
+        tools = [
+            types.Tool(google_search=types.GoogleSearch()),
+        ]
 
-            model = "gemini-3-flash-preview"
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[
-                        types.Part.from_text(text=content),
-                    ],
-                ),
-            ]
-
-            tools = [
-                types.Tool(google_search=types.GoogleSearch()),
-            ]
-
-            generate_content_config = types.GenerateContentConfig(
-                temperature=0.65,
-                tools=tools,
-                response_mime_type="text/plain",
-                system_instruction=[
-                    types.Part.from_text(text="""You are a senior software engineer and system architect.
+        generate_content_config = types.GenerateContentConfig(
+            temperature=0.65,
+            tools=tools,
+            response_mime_type="text/plain",
+            system_instruction=[
+                types.Part.from_text(text="""You are a senior software engineer and system architect.
 
 You are part of an elite council of AI specialists providing superior advice to a code agent.
 Your expertise spans multiple programming languages, system design, performance optimization,
 and software engineering best practices. Provide detailed, actionable advice with code examples
 when appropriate."""),
-                ],
-            )
+            ],
+        )
+
+        return dict(
+            model=model,
+            contents=contents,
+            config=generate_content_config,
+        )
+
+    def call_gemini_pro(self, content: str) -> str:
+        """Make API call to Gemini 3 Flash."""
+        try:
+            print("[GEMINI] Consulting Gemini 3 Flash...")
 
             # Collect streaming response
             response_text = ""
-            for chunk in self.gemini_client.models.generate_content_stream(
-                model=model,
-                contents=contents,
-                config=generate_content_config,
-            ):
+            for chunk in self.gemini_client.models.generate_content_stream(**self._gemini_request(content)):
                 if hasattr(chunk, 'text') and chunk.text:
                     response_text += chunk.text
 
@@ -306,38 +358,79 @@ when appropriate."""),
         except Exception as e:
             return f"Error calling Gemini 3 Flash: {str(e)}"
 
-    def call_deepseek_reasoner(self, content: str) -> str:
-        """Make API call to DeepSeek Reasoner."""
+    async def acall_gemini_pro(self, content: str) -> str:
+        """Make async API call to Gemini 3 Flash."""
         try:
-            print("[DEEPSEEK] Consulting DeepSeek Reasoner...")
+            print("[GEMINI] Consulting Gemini 3 Flash...")
 
-            response = self.deepseek_client.chat.completions.create(
-                model="deepseek-reasoner",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are a senior software engineer and system architect with deep reasoning capabilities.
+            # Collect streaming response
+            response_text = ""
+            stream = await self.gemini_client.aio.models.generate_content_stream(**self._gemini_request(content))
+            async for chunk in stream:
+                if hasattr(chunk, 'text') and chunk.text:
+                    response_text += chunk.text
+
+            return response_text if response_text else "No response received from Gemini"
+
+        except Exception as e:
+            return f"Error calling Gemini 3 Flash: {str(e)}"
+
+    def _deepseek_request(self, content: str) -> dict:
+        """Build the keyword arguments for the DeepSeek Reasoner chat call."""
+        return dict(
+            model="deepseek-reasoner",
+            messages=[
+                {
+                    "role": "system",
+                    "content": """You are a senior software engineer and system architect with deep reasoning capabilities.
 
 You are part of an elite council of AI specialists providing superior advice to a code agent.
 Your expertise spans algorithm design, system optimization, mathematical modeling, and complex problem-solving.
 Use your reasoning capabilities to provide thorough analysis, consider edge cases, and offer innovative solutions.
 Be methodical, analytical, and provide step-by-step reasoning when appropriate."""
-                    },
-                    {
-                        "role": "user",
-                        "content": content
-                    }
-                ],
-                stream=False
-            )
+                },
+                {
+                    "role": "user",
+                    "content": content
+                }
+            ],
+            stream=False
+        )
 
+    def call_deepseek_reasoner(self, content: str) -> str:
+        """Make API call to DeepSeek Reasoner."""
+        try:
+            print("[DEEPSEEK] Consulting DeepSeek Reasoner...")
+
+            if self.deepseek_client is None:
+                self.deepseek_client = OpenAI(
+                    api_key=os.environ.get("DEEPSEEK_API_KEY"),
+                    base_url="https://api.deepseek.com"
+                )
+            response = self.deepseek_client.chat.completions.create(**self._deepseek_request(content))
+            return response.choices[0].message.content
+
+        except Exception as e:
+            return f"Error calling DeepSeek Reasoner: {str(e)}"
+
+    async def acall_deepseek_reasoner(self, content: str) -> str:
+        """Make async API call to DeepSeek Reasoner."""
+        try:
+            print("[DEEPSEEK] Consulting DeepSeek Reasoner...")
+
+            response = await self.deepseek_async_client.chat.completions.create(**self._deepseek_request(content))
             return response.choices[0].message.content
 
         except Exception as e:
             return f"Error calling DeepSeek Reasoner: {str(e)}"
 
     def run_parallel_consultation(self, content: str) -> Tuple[str, str, str]:
-        """Run all three API calls in parallel."""
+        """
+        Run all three API calls in parallel threads, for callers without an event loop.
+
+        The call_* methods build the blocking OpenAI and DeepSeek clients on first
+        use; run_async_consultation is the API council_tool and main() use.
+        """
         print("\n[COUNCIL] Convening the Council of AI Specialists...\n")
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
@@ -353,6 +446,25 @@ Be methodical, analytical, and provide step-by-step reasoning when appropriate."
 
         return openai_response, gemini_response, deepseek_response
 
+    async def run_async_consultation(self, content: str) -> Tuple[str, str, str]:
+        """
+        Run all three API calls concurrently on the event loop.
+
+        This is the main consultation API. It closes the async clients when done,
+        so each initialize_clients call serves one consultation.
+        """
+        print("\n[COUNCIL] Convening the Council of AI Specialists...\n")
+
+        # Close the async clients' connection pools on this event loop once all calls finish
+        async with self.openai_async_client, self.deepseek_async_client, self.gemini_client.aio:
+            openai_response, gemini_response, deepseek_response = await asyncio.gather(
+                self.acall_openai_o3(content),
+                self.acall_gemini_pro(content),
+                self.acall_deepseek_reasoner(content),
+            )
+
+        return openai_response, gemini_response, deepseek_response
+
     def format_council_response(self, openai_response: str, gemini_response: str, deepseek_response: str) -> str:
         """Format the council's collective response."""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -457,7 +569,7 @@ Examples:
         )
 
         # Run parallel consultation
-        openai_response, gemini_response, deepseek_response = council.run_parallel_consultation(content)
+        openai_response, gemini_response, deepseek_response = asyncio.run(council.run_async_consultation(content))
 
         # Format and display results
         formatted_response = council.format_council_response(openai_response, gemini_response, deepseek_response)
@@ -1,4 +1,5 @@
 import os
+import re
 import datetime
 import platform
 import json
@@ -73,16 +74,16 @@ def get_git_ignored_set(cwd, items):
     if not items:
         return set()
     try:
-        input_text = "\n".join(items)
+        # NUL-terminated bytes I/O: no locale re-encoding, and names may contain newlines
+        input_bytes = "\0".join(items).encode("utf-8") + b"\0"
         result = subprocess.run(
-            ["git", "-C", cwd, "check-ignore", "--stdin"],
-            input=input_text,
+            ["git", "-C", cwd, "check-ignore", "-z", "--stdin"],
+            input=input_bytes,
             capture_output=True,
-            text=True,
             check=False,
         )
-        # git check-ignore prints one ignored path per line (exit code 0 = some ignored, 1 = none ignored)
-        return set(line.strip() for line in result.stdout.splitlines() if line.strip())
+        # git check-ignore prints one ignored path per NUL (exit code 0 = some ignored, 1 = none ignored)
+        return {name.decode("utf-8", "surrogateescape") for name in result.stdout.split(b"\0") if name}
     except Exception:
         return set()
 
@@ -99,7 +100,64 @@ def _matches_default_ignore(name):
 
 
 def is_git_repo(path):
-    """Check if the given path is a git repository."""
+    """Check if the given path is a git repository.
+
+    Walks up from `path` looking for a `.git` directory (or a `.git` file, as
+    used by worktrees and submodules) instead of forking `git rev-parse`.
+    Falls back to asking git when the cheap probe is inconclusive.
+    """
+    if os.environ.get("GIT_DIR") or os.environ.get("GIT_WORK_TREE"):
+        return _git_is_inside_work_tree(path)
+
+    path = os.path.abspath(path)
+    # Only hits are cached, so a later `git init` is still picked up
+    marker = _GIT_MARKER_CACHE.get(path)
+    if marker is not None and os.path.exists(marker):
+        return True
+
+    found = _find_git_marker(path)
+    if found is None:
+        return _git_is_inside_work_tree(path)
+    return found
+
+
+_GIT_MARKER_CACHE = {}
+_GIT_MARKER_CACHE_SIZE = 128
+
+
+def _find_git_marker(path):
+    """Return True/False if a `.git` marker was (not) found above `path`, None if unsure."""
+    try:
+        device = os.stat(path).st_dev
+    except OSError:
+        return None
+
+    # Inside the .git directory itself git reports "not a work tree"
+    if '.git' in path.split(os.sep) or os.path.islink(path):
+        return None
+
+    current = path
+    while True:
+        marker = os.path.join(current, '.git')
+        if os.path.isdir(marker) or os.path.isfile(marker):
+            if len(_GIT_MARKER_CACHE) >= _GIT_MARKER_CACHE_SIZE:
+                _GIT_MARKER_CACHE.clear()
+            _GIT_MARKER_CACHE[path] = marker
+            return True
+        parent = os.path.dirname(current)
+        if parent == current:
+            return False
+        try:
+            # git stops discovery at filesystem boundaries by default
+            if os.stat(parent).st_dev != device:
+                return False
+        except OSError:
+            return None
+        current = parent
+
+
+def _git_is_inside_work_tree(path):
+    """Ask git directly whether `path` is inside a work tree."""
     try:
         result = subprocess.run(
             ["git", "-C", path, "rev-parse", "--is-inside-work-tree"],
@@ -112,11 +170,14 @@ def is_git_repo(path):
         return False
 
 
-def get_system_prompt(cwd=None):
-    """Generate the system prompt with dynamic values filled in."""
-    if cwd is None:
-        cwd = os.getcwd()
+# Rendered templates keyed on (cwd, date, is_repo); model and platform never change
+_PROMPT_CACHE = {}
+
+_PLACEHOLDER_RE = re.compile(r'\{(is_git_repo|platform|date|model|directory_structure)\}')
 
+
+def _render_template(date_format, is_repo):
+    """Read system_message.txt and substitute the static placeholders."""
     # The system message template is now in the same directory as this file
     template_path = os.path.join(os.path.dirname(__file__), 'system_message.txt')
 
@@ -134,6 +195,25 @@ def get_system_prompt(cwd=None):
         except Exception as e:
             raise RuntimeError(f"Could not read system_message.txt: {e}")
 
+    # Replace placeholders in the template with actual values in a single pass;
+    # the directory structure placeholder is removed entirely
+    substitutions = {
+        'is_git_repo': "Yes" if is_repo else "No",
+        'platform': platform.system().lower(),
+        'date': date_format,
+        'model': "gemini-2.5-pro",
+        'directory_structure': "",
+    }
+    system_message = _PLACEHOLDER_RE.sub(lambda m: substitutions[m.group(1)], system_message)
+
+    return system_message
+
+
+def get_system_prompt(cwd=None):
+    """Generate the system prompt with dynamic values filled in."""
+    if cwd is None:
+        cwd = os.getcwd()
+
     # Get current date in format M/D/YYYY (Windows-compatible)
     today = datetime.datetime.now()
     if platform.system() == 'Windows':
@@ -144,18 +224,18 @@ def get_system_prompt(cwd=None):
     # Check if directory is a git repo
     is_repo = is_git_repo(cwd)
 
-    # Replace placeholders in the template with actual values
-    # system_message = system_message.replace("{working_directory}", cwd)
-    system_message = system_message.replace("{is_git_repo}", "Yes" if is_repo else "No")
-    system_message = system_message.replace("{platform}", platform.system().lower())
-    system_message = system_message.replace("{date}", date_format)
-    system_message = system_message.replace("{model}", "gemini-2.5-pro")
+    # Drop renders from previous days, then reuse today's render if we have one
+    for stale_key in [k for k in _PROMPT_CACHE if k[1] != date_format]:
+        del _PROMPT_CACHE[stale_key]
 
-    # Remove the directory structure placeholder entirely
-    system_message = system_message.replace("{directory_structure}", "")
+    cache_key = (cwd, date_format, is_repo)
+    system_message = _PROMPT_CACHE.get(cache_key)
+    if system_message is None:
+        system_message = _render_template(date_format, is_repo)
+        _PROMPT_CACHE[cache_key] = system_message
 
     # Add working directory message with ls output
-    ls_output = get_simple_directory_listing(cwd)
+    ls_output = get_simple_directory_listing(cwd, is_repo=is_repo)
     working_dir_message = f"\nWe are now in the {cwd} working directory.\nCurrent directory contents: {ls_output}\n"
     system_message = system_message + working_dir_message
 
@@ -167,16 +247,19 @@ def get_system_prompt(cwd=None):
     return system_message
 
 
-def get_simple_directory_listing(cwd):
+def get_simple_directory_listing(cwd, is_repo=None):
     """Get a simple, non-recursive directory listing similar to 'ls' command.
 
     Filters out gitignored entries when inside a git repo, or applies a
-    sensible default ignore set otherwise.
+    sensible default ignore set otherwise. Pass `is_repo` when the caller
+    has already checked whether `cwd` is inside a git repo.
     """
     try:
         raw_items = sorted(os.listdir(cwd))
 
-        if is_git_repo(cwd):
+        if is_repo is None:
+            is_repo = is_git_repo(cwd)
+        if is_repo:
             ignored = get_git_ignored_set(cwd, raw_items)
             ignored.add('.git')  # git check-ignore never flags .git itself
             filtered = [i for i in raw_items if i not in ignored]
@@ -202,13 +285,12 @@ def get_git_status(cwd):
         branch_cmd = ["git", "-C", cwd, "rev-parse", "--abbrev-ref", "HEAD"]
         branch = subprocess.run(branch_cmd, capture_output=True, text=True, check=False).stdout.strip()
 
-        # Get remote main branch
-        main_branch_cmd = ["git", "-C", cwd, "remote", "show", "origin"]
-        main_output = subprocess.run(main_branch_cmd, capture_output=True, text=True, check=False).stdout
+        # Get remote main branch from the local origin/HEAD ref (never touches the network)
+        main_branch_cmd = ["git", "-C", cwd, "symbolic-ref", "--short", "refs/remotes/origin/HEAD"]
+        main_ref = subprocess.run(main_branch_cmd, capture_output=True, text=True, check=False).stdout.strip()
         main_branch = "main"  # Default
-        for line in main_output.splitlines():
-            if "HEAD branch" in line:
-                main_branch = line.split(":")[-1].strip()
+        if main_ref:
+            main_branch = main_ref.removeprefix("origin/")
 
         # Get status
         status_cmd = ["git", "-C", cwd, "status", "--porcelain"]
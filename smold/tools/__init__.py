@@ -1,39 +1,43 @@
 """Tool implementations for SmolD.
 
 This package contains the implementations of tools that can be used by SmolD.
+Tool classes are imported lazily on first attribute access (PEP 562), so
+importing a single tool module does not load every other tool.
 """
 
+import importlib
 import platform
 
-# Import platform-independent tools
-from .cd_tool import ChangeDirectoryTool
-from .edit_tool import FileEditTool as EditTool
-from .glob_tool import GlobTool
-from .grep_tool import GrepTool
-from .ls_tool import LSTool
-from .replace_tool import WriteTool as ReplaceTool
-from .view_tool import ViewTool
-
-# Import platform-specific shell tools
-__all__ = [
-    "ChangeDirectoryTool",
-    "EditTool",
-    "GlobTool", 
-    "GrepTool",
-    "LSTool",
-    "ReplaceTool",
-    "ViewTool",
-]
+# Exported name -> (submodule, attribute within that submodule)
+_LAZY = {
+    "ChangeDirectoryTool": ("cd_tool", "ChangeDirectoryTool"),
+    "EditTool": ("edit_tool", "FileEditTool"),
+    "GlobTool": ("glob_tool", "GlobTool"),
+    "GrepTool": ("grep_tool", "GrepTool"),
+    "LSTool": ("ls_tool", "LSTool"),
+    "ReplaceTool": ("replace_tool", "WriteTool"),
+    "ViewTool": ("view_tool", "ViewTool"),
+}
 
+# Platform-specific shell tools
 if platform.system() == 'Windows':
-    try:
-        from .powershell_tool import PowerShellTool
-        __all__.append("PowerShellTool")
-    except ImportError:
-        pass
+    _LAZY["PowerShellTool"] = ("powershell_tool", "PowerShellTool")
 else:
+    _LAZY["BashTool"] = ("bash_tool", "BashTool")
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
     try:
-        from .bash_tool import BashTool
-        __all__.append("BashTool")
-    except ImportError:
-        pass
\ No newline at end of file
+        module_name, attr_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    module = importlib.import_module(f".{module_name}", __name__)
+    attr = getattr(module, attr_name)
+    globals()[name] = attr
+    return attr
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -7,11 +7,18 @@ helpful suggestions, and safety features.
 
 import os
 import platform
+import stat
 from pathlib import Path
 from typing import Optional
 
 from smolagents import Tool
 
+try:
+    # Optional C implementation; falls back to the pure-Python distance below
+    from rapidfuzz.distance import Levenshtein
+except ImportError:
+    Levenshtein = None
+
 
 class ChangeDirectoryTool(Tool):
     """
@@ -57,17 +64,17 @@ Safety Features:
         self.previous_directory = None
         self.restricted_dirs = self._get_restricted_directories()
     
-    def _get_restricted_directories(self) -> list[str]:
-        """Get list of restricted system directories to prevent accidental access."""
+    def _get_restricted_directories(self) -> tuple[str, ...]:
+        """Get normalized, lowercased restricted system directories to prevent accidental access."""
         if platform.system() == "Windows":
-            return [
+            dirs = [
                 "C:\\Windows\\System32",
                 "C:\\Windows\\SysWOW64", 
                 "C:\\Program Files",
                 "C:\\Program Files (x86)"
             ]
         else:
-            return [
+            dirs = [
                 "/bin",
                 "/sbin", 
                 "/usr/bin",
@@ -77,6 +84,8 @@ Safety Features:
                 "/proc",
                 "/sys"
             ]
+        # Normalized once here so the check is a single str.startswith(tuple) call
+        return tuple(os.path.normpath(d).lower() for d in dirs)
     
     def forward(self, path: str) -> str:
         """
@@ -111,7 +120,8 @@ Safety Features:
                 return validation_result["message"]
             
             # Check if it's a restricted directory
-            if self._is_restricted_directory(target_path):
+            normalized_path = os.path.normpath(target_path).lower()
+            if self._is_restricted_directory_norm(normalized_path):
                 return f"Error: Cannot change to restricted system directory '{target_path}'. This is prevented for safety reasons."
             
             # Attempt to change directory
@@ -148,7 +158,13 @@ Current:  {new_dir}{special_note}
         Returns:
             Dictionary with validation result and message
         """
-        if not os.path.exists(path):
+        try:
+            # One stat answers both "exists" and "is a directory"
+            st = os.stat(path)
+        except OSError:
+            st = None
+        
+        if st is None:
             suggestions = self._get_directory_suggestions(path)
             suggestion_text = f"\n\nDid you mean one of these?\n{suggestions}" if suggestions else ""
             
@@ -157,7 +173,7 @@ Current:  {new_dir}{special_note}
                 "message": f"Error: Directory '{path}' does not exist.{suggestion_text}"
             }
         
-        if not os.path.isdir(path):
+        if not stat.S_ISDIR(st.st_mode):
             return {
                 "valid": False,
                 "message": f"Error: '{path}' exists but is not a directory."
@@ -175,13 +191,19 @@ Current:  {new_dir}{special_note}
         Returns:
             True if restricted, False otherwise
         """
-        normalized_path = os.path.normpath(path).lower()
-        
-        for restricted in self.restricted_dirs:
-            if normalized_path.startswith(os.path.normpath(restricted).lower()):
-                return True
+        return self._is_restricted_directory_norm(os.path.normpath(path).lower())
+    
+    def _is_restricted_directory_norm(self, normalized_path: str) -> bool:
+        """
+        Check an already normalized, lowercased path against the restricted directories.
         
-        return False
+        Args:
+            normalized_path: Result of os.path.normpath(path).lower()
+            
+        Returns:
+            True if restricted, False otherwise
+        """
+        return normalized_path.startswith(self.restricted_dirs)
     
     def _get_directory_suggestions(self, path: str) -> str:
         """
@@ -202,17 +224,20 @@ Current:  {new_dir}{special_note}
             
             # Find similar directory names
             similar_dirs = []
-            for item in os.listdir(parent_dir):
-                item_path = os.path.join(parent_dir, item)
-                if os.path.isdir(item_path):
-                    # Simple similarity check (contains target or target contains item)
-                    if (target_name in item.lower() or 
-                        item.lower() in target_name or
-                        self._levenshtein_distance(target_name, item.lower()) <= 2):
-                        similar_dirs.append(item)
+            with os.scandir(parent_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        item_lower = entry.name.lower()
+                        # Simple similarity check (contains target or target contains item)
+                        if (target_name in item_lower or 
+                            item_lower in target_name or
+                            self._within_edit_distance(target_name, item_lower, 2)):
+                            similar_dirs.append(entry.name)
+                            if len(similar_dirs) == 5:
+                                break
             
             if similar_dirs:
-                suggestions = "\n".join(f"  - {parent_dir}/{dir_name}" for dir_name in similar_dirs[:5])
+                suggestions = "\n".join(f"  - {parent_dir}/{dir_name}" for dir_name in similar_dirs)
                 return suggestions
             
             return ""
@@ -220,6 +245,19 @@ Current:  {new_dir}{special_note}
         except Exception:
             return ""
     
+    def _within_edit_distance(self, s1: str, s2: str, max_distance: int) -> bool:
+        """
+        Check whether two strings are at most max_distance edits apart.
+        
+        Uses rapidfuzz when installed, which stops as soon as the cutoff is exceeded.
+        """
+        if Levenshtein is not None:
+            return Levenshtein.distance(s1, s2, score_cutoff=max_distance) <= max_distance
+        # The distance is at least the length difference, so skip obvious misses
+        if abs(len(s1) - len(s2)) > max_distance:
+            return False
+        return self._levenshtein_distance(s1, s2) <= max_distance
+    
     def _levenshtein_distance(self, s1: str, s2: str) -> int:
         """
         Calculate Levenshtein distance between two strings.
@@ -237,6 +275,9 @@ Current:  {new_dir}{special_note}
         if len(s2) == 0:
             return len(s1)
         
+        if len(s2) <= 64:
+            return self._myers_distance(s2, s1)
+        
         previous_row = list(range(len(s2) + 1))
         for i, c1 in enumerate(s1):
             current_row = [i + 1]
@@ -249,6 +290,49 @@ Current:  {new_dir}{special_note}
         
         return previous_row[-1]
     
+    def _myers_distance(self, pattern: str, text: str) -> int:
+        """
+        Calculate Levenshtein distance with Myers' bit-parallel algorithm.
+        
+        Each DP column is held as bit-vectors in a single int, so the inner loop
+        over the pattern becomes a handful of int operations per text character.
+        
+        Args:
+            pattern: The shorter string (at most 64 characters)
+            text: The other string
+            
+        Returns:
+            Edit distance between the strings
+        """
+        m = len(pattern)
+        full_mask = (1 << m) - 1
+        last_bit = 1 << (m - 1)
+        
+        # Bit i of peq[c] is set when pattern[i] == c
+        peq = {}
+        for i, c in enumerate(pattern):
+            peq[c] = peq.get(c, 0) | (1 << i)
+        
+        pv = full_mask  # Positive vertical deltas
+        mv = 0  # Negative vertical deltas
+        score = m
+        for c in text:
+            eq = peq.get(c, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & full_mask)
+            mh = pv & xh
+            if ph & last_bit:
+                score += 1
+            elif mh & last_bit:
+                score -= 1
+            ph = ((ph << 1) | 1) & full_mask
+            mh = (mh << 1) & full_mask
+            pv = mh | (~(xv | ph) & full_mask)
+            mv = ph & xv
+        
+        return score
+    
     def _get_directory_summary(self, path: str) -> str:
         """
         Get a helpful summary of the directory contents.
@@ -260,19 +344,16 @@ Current:  {new_dir}{special_note}
             Summary string with directory information
         """
         try:
-            items = os.listdir(path)
-            if not items:
-                return "Directory is empty."
-            
             files = []
             dirs = []
             
-            for item in items:
-                item_path = os.path.join(path, item)
-                if os.path.isdir(item_path):
-                    dirs.append(item)
-                else:
-                    files.append(item)
+            # DirEntry.is_dir() uses the cached d_type, avoiding a stat per item
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    (dirs if entry.is_dir() else files).append(entry.name)
+            
+            if not dirs and not files:
+                return "Directory is empty."
             
             summary_parts = []
             
@@ -5,21 +5,47 @@ This tool provides access to a council of AI specialists (OpenAI gpt-5-mini, Gem
 and DeepSeek Reasoner) for expert technical consultation directly from within SmolD.
 """
 
+import asyncio
+import concurrent.futures
+import hashlib
 import os
 import sys
-import tempfile
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional
 from smolagents import Tool
 
-# Add the smold directory to the path to import council
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# CouncilConsultation, imported on first use: council pulls in the openai,
+# google-genai and tiktoken SDKs, which most sessions never need
+_COUNCIL_CLS = None
 
-try:
-    from council import CouncilConsultation
-except ImportError as e:
-    print(f"Warning: Could not import council functionality: {e}")
-    CouncilConsultation = None
+
+def _get_council_cls():
+    """Import and cache CouncilConsultation, or return None if it is unavailable."""
+    global _COUNCIL_CLS
+    if _COUNCIL_CLS is None:
+        # Add the smold directory to the path to import council
+        smold_dir = str(Path(__file__).parent.parent)
+        if smold_dir not in sys.path:
+            sys.path.insert(0, smold_dir)
+        try:
+            from council import CouncilConsultation
+        except (ImportError, SystemExit) as e:
+            # council exits on missing SDKs, which must not take the agent down
+            print(f"Warning: Could not import council functionality: {e}")
+            return None
+        _COUNCIL_CLS = CouncilConsultation
+    return _COUNCIL_CLS
+
+# Formatted responses keyed by a hash of the consultation content, most recent
+# last; only used when SMOLD_COUNCIL_CACHE=1
+_COUNCIL_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_CACHE_MAX = 128
+
+# Set when the user answers "always" to the confirmation prompt; later
+# consultations in this session skip the prompt (as does SMOLD_COUNCIL_AUTOCONFIRM=1)
+_CONFIRMED = False
 
 # Import user input tool for confirmation
 try:
@@ -32,6 +58,38 @@ def consult_council(prompt: str, context: str = "", context_file: str = "") -> s
     """
     Consult the Council of AI Specialists for expert technical advice.
     
+    Synchronous entry point for aconsult_council. If called from inside a running
+    event loop, the consultation runs on its own loop in a worker thread.
+    
+    Args:
+        prompt: The main question or request for the council
+        context: Additional context information (optional)
+        context_file: Path to a file with context information (optional)
+    
+    Returns:
+        Formatted response from all three AI specialists
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(aconsult_council(prompt, context, context_file))
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, aconsult_council(prompt, context, context_file)).result()
+
+
+def _save_log(council, content: str, formatted_response: str) -> None:
+    """Save the consultation log, reporting rather than raising on failure."""
+    try:
+        council.save_consultation_log(content, formatted_response)
+    except Exception as log_error:
+        print(f"Warning: Could not save consultation log: {log_error}")
+
+
+async def aconsult_council(prompt: str, context: str = "", context_file: str = "") -> str:
+    """
+    Consult the Council of AI Specialists, querying all three models concurrently.
+    
     Args:
         prompt: The main question or request for the council
         context: Additional context information (optional)
@@ -40,13 +98,13 @@ def consult_council(prompt: str, context: str = "", context_file: str = "") -> s
     Returns:
         Formatted response from all three AI specialists
     """
-    if CouncilConsultation is None:
+    council_cls = _get_council_cls()
+    if council_cls is None:
         return "Error: Council consultation is not available. Missing dependencies or import failed."
     
     try:
-        # Initialize the council
-        council = CouncilConsultation()
-        council.initialize_clients()
+        # Initialize the council; preparing the content only needs its tokenizer
+        council = council_cls()
         
         # Prepare consultation content
         content = council.prepare_consultation_content(
@@ -55,17 +113,32 @@ def consult_council(prompt: str, context: str = "", context_file: str = "") -> s
             context_file=context_file
         )
         
+        # Identical content (prompt, context and context file text) gets the same answer
+        use_cache = os.environ.get("SMOLD_COUNCIL_CACHE") == "1"
+        if use_cache:
+            key = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+            cached = _COUNCIL_CACHE.get(key)
+            if cached is not None:
+                _COUNCIL_CACHE.move_to_end(key)
+                return cached
+        
+        # Only a cache miss needs the API clients (and the API keys)
+        council.initialize_clients()
+        
         # Run parallel consultation
-        openai_response, gemini_response, deepseek_response = council.run_parallel_consultation(content)
+        openai_response, gemini_response, deepseek_response = await council.run_async_consultation(content)
         
         # Format and return results
         formatted_response = council.format_council_response(openai_response, gemini_response, deepseek_response)
         
-        # Optionally save consultation log
-        try:
-            council.save_consultation_log(content, formatted_response)
-        except Exception as log_error:
-            print(f"Warning: Could not save consultation log: {log_error}")
+        if use_cache:
+            _COUNCIL_CACHE[key] = formatted_response
+            if len(_COUNCIL_CACHE) > _CACHE_MAX:
+                _COUNCIL_CACHE.popitem(last=False)
+        
+        # Save the consultation log off the response path; a non-daemon thread
+        # still finishes writing if the process is about to exit
+        threading.Thread(target=_save_log, args=(council, content, formatted_response)).start()
         
         return formatted_response
         
@@ -127,15 +200,22 @@ The council provides superior advice through diverse expertise:
         Returns:
             Formatted response from all three AI specialists
         """
+        global _CONFIRMED
+        
         # User confirmation for council consultation
-        if user_input_tool is not None:
+        confirmed = _CONFIRMED or os.environ.get("SMOLD_COUNCIL_AUTOCONFIRM") == "1"
+        if user_input_tool is not None and not confirmed:
             confirmation = user_input_tool.forward(
                 "Council Consultation Request: You are about to consult a council of AI specialists "
                 "(OpenAI gpt-5-mini, Gemini 3 Flash, and DeepSeek Reasoner) for expert technical advice. "
                 "This will make API calls to external services and may consume API credits. "
-                "Are you sure you want to proceed with the council consultation? (yes/no)"
+                "Are you sure you want to proceed with the council consultation? "
+                "(yes/no, or 'always' to stop asking for this session)"
             )
-            if confirmation.lower() not in ['yes', 'y']:
+            answer = confirmation.strip().lower()
+            if answer == 'always':
+                _CONFIRMED = True
+            elif answer not in ['yes', 'y']:
                 return "Council consultation cancelled by user. No API calls were made to external services."
         
         return consult_council(prompt, context, context_file)
@@ -5,10 +5,14 @@ This tool allows editing files in the local filesystem.
 It supports replacing specific text strings within files and creating new files.
 """
 
+import codecs
 import os
 import difflib
+import mmap
 import re
-from typing import Optional, Dict, Any
+import stat
+import tempfile
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 
 from smolagents import Tool
@@ -16,6 +20,15 @@ from smolagents import Tool
 # Constants
 MAX_DIFF_SIZE = 50000  # Maximum diff size in characters
 DIFF_TRUNCATION_MESSAGE = "(Diff output truncated due to size)"
+MMAP_THRESHOLD = 1024 * 1024  # Files at least this large are searched via mmap first
+
+# Whitespace normalization: runs of spaces/tabs, and whitespace at either end of a line
+_WS_RE = re.compile(r'[ \t]+')
+_LINE_WS_RE = re.compile(r'^[^\S\n]+|[^\S\n]+$', re.MULTILINE)
+
+# Line-number prefixes as printed by the View tool ("   12\t...")
+_LN_PROBE = re.compile(r'^\s*\d+\t', re.MULTILINE)
+_LN_LINE = re.compile(r'^\s*\d+\t(.*)$')
 
 
 class FileEditTool(Tool):
@@ -110,8 +123,14 @@ GENERAL EDITING GUIDELINES
         if not os.path.isabs(file_path):
             file_path = os.path.abspath(file_path)
         
+        # One stat answers existence and file type for everything below
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            st = None
+        
         # Check if we're creating a new file
-        is_new_file = not os.path.exists(file_path) and old_string == ""
+        is_new_file = st is None and old_string == ""
         
         # If creating a new file, ensure parent directory exists
         if is_new_file:
@@ -121,8 +140,7 @@ GENERAL EDITING GUIDELINES
             
             # Create the new file
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(new_string)
+                self._write_file(file_path, new_string)
                     
                 # For new files, directly create a formatted snippet from the new content
                 return f"The file {file_path} has been updated. Here's the result of running `cat -n` on a snippet of the edited file:\n{self._add_line_numbers(new_string)}"
@@ -130,13 +148,14 @@ GENERAL EDITING GUIDELINES
                 return f"Error creating file '{file_path}': {str(e)}"
         
         # For existing files, check if file exists
-        if not os.path.exists(file_path):
+        if st is None:
             return f"Error: File '{file_path}' does not exist"
         
-        if not os.path.isfile(file_path):
+        if not stat.S_ISREG(st.st_mode):
             return f"Error: Path '{file_path}' is not a file"
         
-        # Check if file is writable
+        # Check if file is writable; the atomic rename would otherwise succeed on
+        # a read-only file, and mode bits alone ignore ownership and ACLs
         if not os.access(file_path, os.W_OK):
             return f"Error: File '{file_path}' is not writable"
         
@@ -145,19 +164,26 @@ GENERAL EDITING GUIDELINES
         
         # Read the file content
         try:
-            encodings = ['utf-8', 'latin-1', 'cp1252']
-            file_content = None
+            # Large files: try an exact match on the raw bytes before decoding anything
+            # (only where newlines are written unchanged, as the bytes are copied as-is)
+            if cleaned_old_string and st.st_size >= MMAP_THRESHOLD and os.linesep == '\n':
+                result = self._edit_large_file(file_path, cleaned_old_string, new_string)
+                if result is not None:
+                    return result
             
-            for encoding in encodings:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        file_content = f.read()
-                    break
-                except UnicodeDecodeError:
-                    continue
+            # Read once, then decode in memory; latin-1 accepts any byte sequence,
+            # so it is the final fallback and decoding can no longer fail
+            raw_content = Path(file_path).read_bytes()
+            try:
+                file_content = raw_content.decode('utf-8')
+                is_utf8 = True
+            except UnicodeDecodeError:
+                file_content = raw_content.decode('latin-1')
+                is_utf8 = False
             
-            if file_content is None:
-                return f"Error: Could not decode the file with any supported encoding"
+            # Match text-mode reading, which translated \r\n and \r to \n
+            if '\r' in file_content:
+                file_content = file_content.replace('\r\n', '\n').replace('\r', '\n')
             
             # Special handling for empty old_string
             if cleaned_old_string == "":
@@ -165,43 +191,48 @@ GENERAL EDITING GUIDELINES
                 # 1. Create a new file (handled above in is_new_file case)
                 # 2. Append to an existing file (handled here)
                 new_content = file_content + new_string
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
+                if is_utf8:
+                    self._append_file(file_path, new_string)
+                else:
+                    # Rewritten whole, so the file ends up UTF-8 throughout
+                    self._write_file(file_path, new_content)
                     
                 # Get a snippet of the modified file
                 snippet = self._get_snippet(new_content, "", new_string)
                 return self._format_result(file_path, snippet)
             
-            # For non-empty old_string, check if it's in the file
-            if cleaned_old_string not in file_content:
+            # For non-empty old_string, locate its first occurrence in one scan
+            match_start = file_content.find(cleaned_old_string)
+            if match_start == -1:
                 # Try with normalized whitespace
                 normalized_old = self._normalize_whitespace(cleaned_old_string)
-                normalized_content = self._normalize_whitespace(file_content)
-                
-                if normalized_old in normalized_content:
-                    # Find the original text using normalized matching
-                    original_text = self._find_original_text(file_content, cleaned_old_string, normalized_old, normalized_content)
-                    if original_text:
-                        new_content = file_content.replace(original_text, new_string, 1)
-                    else:
-                        return self._suggest_alternatives(file_path, file_content, cleaned_old_string, old_string)
-                else:
+                span = self._find_original_text(file_content, normalized_old)
+                if span is None:
                     return self._suggest_alternatives(file_path, file_content, cleaned_old_string, old_string)
+                
+                # Splice at the mapped span rather than replacing the first equal text
+                orig_start, orig_end = span
+                new_content = file_content[:orig_start] + new_string + file_content[orig_end:]
             else:
-                # Count occurrences (only for non-empty strings)
-                occurrences = file_content.count(cleaned_old_string)
-                if occurrences > 1:
+                # A second hit means the edit is ambiguous; only then count them all
+                match_end = match_start + len(cleaned_old_string)
+                if file_content.find(cleaned_old_string, match_end) != -1:
+                    occurrences = 1 + file_content.count(cleaned_old_string, match_end)
                     return f"Error: The specified text appears {occurrences} times in the file. Please provide more context to uniquely identify which instance to replace."
                 
-                # Replace the text
-                new_content = file_content.replace(cleaned_old_string, new_string, 1)
-            
-            # Write the changed content back to the file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+                # Splice the replacement in at the match
+                new_content = file_content[:match_start] + new_string + file_content[match_end:]
             
             # Get a snippet of the modified file with line numbers (OpenAGI format)
-            snippet = self._get_snippet(new_content, cleaned_old_string, new_string)
+            new_lines = new_string.split('\n')
+            snippet = self._get_snippet(new_content, cleaned_old_string, new_string, new_lines)
+            
+            # A no-op edit leaves the file (and its mtime) untouched
+            if new_content == file_content:
+                return self._format_result(file_path, snippet) + "\n(no change written)"
+            
+            # Write the changed content back to the file
+            self._write_file(file_path, new_content)
             
             # Return success message with snippet of edited file
             return self._format_result(file_path, snippet)
@@ -209,6 +240,232 @@ GENERAL EDITING GUIDELINES
         except Exception as e:
             return f"Error editing file '{file_path}': {str(e)}"
     
+    def _edit_large_file(self, file_path: str, old_string: str, new_string: str) -> Optional[str]:
+        """
+        Replace a unique, exact match in a large file without decoding the whole file.
+        
+        The file is memory-mapped and searched as UTF-8 bytes; the bytes around the
+        match are copied straight from the mapping into a temporary file, which
+        replaces the original once the mapping and the file are closed.
+        
+        Args:
+            file_path: The file to edit
+            old_string: The text to replace (line numbers already removed)
+            new_string: The text to replace it with
+            
+        Returns:
+            The success message, or None if the caller should use the regular path
+            (no exact match, several matches, \r line endings to normalize, content
+            that is not UTF-8 and so is transcoded there, or a file that has to be
+            written in place)
+        """
+        old_bytes = old_string.encode('utf-8')
+        new_bytes = new_string.encode('utf-8')
+        n_lines_snippet = 4
+        target = os.path.realpath(file_path)
+        
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(b'\r') != -1:
+                return None
+            match_start = mm.find(old_bytes)
+            if match_start == -1:
+                return None
+            match_end = match_start + len(old_bytes)
+            if mm.find(old_bytes, match_end) != -1:
+                return None
+            if not self._is_utf8(mm):
+                return None
+            
+            # Context window: whole lines around the match, as _get_snippet shows them
+            window_start = match_start
+            for _ in range(n_lines_snippet + 1):
+                window_start = mm.rfind(b'\n', 0, window_start)
+                if window_start == -1:
+                    break
+            window_start += 1
+            window_end = match_end - 1
+            for _ in range(n_lines_snippet + 1):
+                window_end = mm.find(b'\n', window_end + 1)
+                if window_end == -1:
+                    window_end = len(mm)
+                    break
+            snippet_bytes = mm[window_start:match_start] + new_bytes + mm[match_end:window_end]
+            
+            if old_bytes == new_bytes:
+                return self._format_result(file_path, snippet_bytes.decode('utf-8', errors='replace')) + "\n(no change written)"
+            
+            with memoryview(mm) as view:
+                tmp_path = self._stage_file_chunks(target, (view[:match_start], new_bytes, view[match_end:]))
+        
+        # Writing in place would truncate the file under the chunks; the regular
+        # path writes it from memory instead
+        if tmp_path is None:
+            return None
+        
+        # Renamed only now: Windows refuses to replace a file that is open or mapped
+        self._replace_with_staged(tmp_path, target)
+        
+        snippet = snippet_bytes.decode('utf-8', errors='replace')
+        return self._format_result(file_path, snippet)
+    
+    def _is_utf8(self, data) -> bool:
+        """Check that a bytes-like object is valid UTF-8, decoding it a megabyte at a time."""
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        try:
+            for start in range(0, len(data), MMAP_THRESHOLD):
+                decoder.decode(data[start:start + MMAP_THRESHOLD])
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            return False
+        return True
+    
+    def _write_file(self, file_path: str, content: str) -> None:
+        """
+        Replace a file's contents, or create the file if it is new.
+        
+        Like writing in text mode, newlines are written as os.linesep.
+        
+        Args:
+            file_path: The file to write (symlinks are written through)
+            content: The new file content
+        """
+        if os.linesep != '\n':
+            content = content.replace('\n', os.linesep)
+        self._write_file_chunks(file_path, (content.encode('utf-8'),))
+    
+    def _write_file_chunks(self, file_path: str, chunks) -> None:
+        """
+        Replace a file's contents with the concatenated byte chunks.
+        
+        Where _stage_file_chunks can, the chunks go to a temporary file that is
+        renamed over the target, so a crash never leaves a half-written file;
+        otherwise the file is written in place.
+        
+        Args:
+            file_path: The file to write (symlinks are written through)
+            chunks: Bytes-like objects to write in order
+        """
+        target = os.path.realpath(file_path)
+        tmp_path = self._stage_file_chunks(target, chunks)
+        if tmp_path is None:
+            self._write_in_place(target, chunks)
+        else:
+            self._replace_with_staged(tmp_path, target)
+    
+    def _stage_file_chunks(self, target: str, chunks) -> Optional[str]:
+        """
+        Write the byte chunks to a temporary file next to an existing target.
+        
+        The temporary file gets the target's mode, owner and group. Nothing is
+        staged for a new file, for a file with other hard links (which a rename
+        would detach), or when the temporary file cannot be created or given the
+        target's owner and group, e.g. in a read-only directory.
+        
+        Args:
+            target: The resolved path of the file to replace
+            chunks: Bytes-like objects to write in order
+            
+        Returns:
+            The temporary file's path, or None if the target should be written in place
+        """
+        try:
+            st = os.stat(target)
+        except FileNotFoundError:
+            return None
+        if st.st_nlink > 1:
+            return None
+        
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix=f".{os.path.basename(target)}.", suffix=".tmp")
+        except OSError:
+            return None
+        
+        try:
+            try:
+                staged = self._copy_owner(fd, st)
+                if staged:
+                    for chunk in chunks:
+                        self._write_all(fd, chunk)
+            finally:
+                os.close(fd)
+            if not staged:
+                os.remove(tmp_path)
+                return None
+            os.chmod(tmp_path, st.st_mode & 0o7777)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return tmp_path
+    
+    def _copy_owner(self, fd: int, st: os.stat_result) -> bool:
+        """Give an open file the owner and group in st, returning False if that is not permitted."""
+        if not hasattr(os, 'fchown'):
+            return True
+        own = os.fstat(fd)
+        if (own.st_uid, own.st_gid) == (st.st_uid, st.st_gid):
+            return True
+        try:
+            os.fchown(fd, st.st_uid, st.st_gid)
+        except OSError:
+            return False
+        return True
+    
+    def _replace_with_staged(self, tmp_path: str, target: str) -> None:
+        """
+        Rename a file staged by _stage_file_chunks over its target.
+        
+        Args:
+            tmp_path: The staged temporary file
+            target: The resolved path of the file to replace
+        """
+        try:
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def _write_in_place(self, target: str, chunks) -> None:
+        """
+        Truncate (or create) a file and write the byte chunks into it.
+        
+        Args:
+            target: The resolved path of the file to write
+            chunks: Bytes-like objects to write in order
+        """
+        # New files get the umask applied to 0o666, as open() would
+        fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o666)
+        try:
+            for chunk in chunks:
+                self._write_all(fd, chunk)
+        finally:
+            os.close(fd)
+    
+    def _append_file(self, file_path: str, content: str) -> None:
+        """
+        Append content to the end of an existing UTF-8 file.
+        
+        Like writing in text mode, newlines are written as os.linesep.
+        
+        Args:
+            file_path: The file to append to
+            content: The text to append
+        """
+        if os.linesep != '\n':
+            content = content.replace('\n', os.linesep)
+        fd = os.open(file_path, os.O_WRONLY | os.O_APPEND | getattr(os, 'O_BINARY', 0))
+        try:
+            self._write_all(fd, content.encode('utf-8'))
+        finally:
+            os.close(fd)
+    
+    def _write_all(self, fd: int, data: bytes) -> None:
+        """Write all of data to fd, looping over partial writes."""
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    
     def _remove_line_numbers(self, text: str) -> str:
         """
         Remove line numbers from text that may have been copied from View tool output.
@@ -219,7 +476,8 @@ GENERAL EDITING GUIDELINES
         Returns:
             Text with line numbers removed
         """
-        if not text:
+        # Clean input is the common case; skip the split/join entirely
+        if not text or not _LN_PROBE.search(text):
             return text
             
         lines = text.split('\n')
@@ -228,7 +486,7 @@ GENERAL EDITING GUIDELINES
         for line in lines:
             # Check if line starts with line number pattern (number followed by tab)
             # Pattern: optional whitespace, number, tab, content
-            match = re.match(r'^\s*\d+\t(.*)$', line)
+            match = _LN_LINE.match(line)
             if match:
                 # Extract content after the tab
                 cleaned_lines.append(match.group(1))
@@ -248,67 +506,106 @@ GENERAL EDITING GUIDELINES
         Returns:
             Text with normalized whitespace
         """
-        # Replace multiple spaces/tabs with single space
-        # Replace different line endings with \n
-        # Strip leading/trailing whitespace from lines
-        lines = text.split('\n')
-        normalized_lines = []
+        # Strip leading/trailing whitespace from every line, then replace
+        # tabs and multiple spaces with a single space - two passes in total
+        return _WS_RE.sub(' ', _LINE_WS_RE.sub('', text))
+    
+    def _normalize_with_index_map(self, text: str) -> Tuple[str, List[int]]:
+        """
+        Normalize whitespace like _normalize_whitespace, also mapping offsets back.
         
-        for line in lines:
-            # Replace tabs and multiple spaces with single space
-            normalized_line = re.sub(r'[ \t]+', ' ', line.strip())
-            normalized_lines.append(normalized_line)
+        Args:
+            text: Text to normalize
+            
+        Returns:
+            The normalized text and a list where entry i is the offset in text
+            of normalized character i (a collapsed run maps to its first char)
+        """
+        parts = []
+        index_map = []
+        offset = 0
+        for line in text.split('\n'):
+            stripped = line.strip()
+            if stripped:
+                base = offset + len(line) - len(line.lstrip())
+                pos = 0
+                for match in _WS_RE.finditer(stripped):
+                    index_map.extend(range(base + pos, base + match.start()))
+                    index_map.append(base + match.start())
+                    pos = match.end()
+                index_map.extend(range(base + pos, base + len(stripped)))
+                parts.append(_WS_RE.sub(' ', stripped))
+            else:
+                parts.append('')
+            offset += len(line) + 1
+            # The newline ending this line
+            index_map.append(offset - 1)
         
-        return '\n'.join(normalized_lines)
+        # The last line has no newline after it
+        index_map.pop()
+        return '\n'.join(parts), index_map
     
-    def _find_original_text(self, file_content: str, original_old_string: str, normalized_old: str, normalized_content: str) -> str:
+    def _find_original_text(self, file_content: str, normalized_old: str) -> Optional[Tuple[int, int]]:
         """
-        Find the original text in file_content that matches the normalized version.
+        Find the span of file_content whose normalized form matches normalized_old.
+        
+        The longest whitespace-free piece of normalized_old appears verbatim in any
+        match, so only the lines around each occurrence of it are normalized. The
+        whole file is normalized only if those windows add up to more than the file.
         
         Args:
             file_content: The original file content
-            original_old_string: The original old string (before normalization)
             normalized_old: The normalized version of old string
-            normalized_content: The normalized version of file content
             
         Returns:
-            The actual text from file_content that matches, or None if not found
+            (start, end) offsets of the matching text in file_content, or None if not found
         """
-        try:
-            # Find where the normalized text appears
-            start_idx = normalized_content.find(normalized_old)
-            if start_idx == -1:
-                return None
-            
-            # We need to map this back to the original content
-            # This is approximate - count characters up to the match point
-            lines = file_content.split('\n')
-            norm_lines = normalized_content.split('\n')
-            
-            # Find which line the match starts on in normalized content
-            chars_before = normalized_content[:start_idx].count('\n')
-            chars_after_start = start_idx - normalized_content[:start_idx].rfind('\n') - 1 if '\n' in normalized_content[:start_idx] else start_idx
-            
-            # Try to find corresponding position in original content
-            if chars_before < len(lines):
-                # Start from the approximate line
-                search_start = sum(len(line) + 1 for line in lines[:chars_before]) - 1 if chars_before > 0 else 0
-                search_start = max(0, search_start)
-                
-                # Look for text that when normalized would match
-                # Try different lengths around the expected area
-                expected_length = len(normalized_old)
-                for length_multiplier in [1.0, 1.2, 1.5, 0.8]:
-                    search_length = int(expected_length * length_multiplier)
-                    if search_start + search_length <= len(file_content):
-                        candidate = file_content[search_start:search_start + search_length]
-                        if self._normalize_whitespace(candidate) == normalized_old:
-                            return candidate
-            
+        if not normalized_old:
             return None
+        
+        tokens = normalized_old.split()
+        if tokens:
+            anchor = max(tokens, key=len)
+            anchor_idx = normalized_old.find(anchor)
+            lines_before = normalized_old.count('\n', 0, anchor_idx)
+            lines_after = normalized_old.count('\n', anchor_idx + len(anchor))
             
-        except Exception:
+            budget = len(file_content)
+            pos = file_content.find(anchor)
+            while pos != -1:
+                if budget <= 0:
+                    break
+                # Whole lines only, so the window normalizes as it would in the file
+                line_start = file_content.rfind('\n', 0, pos) + 1
+                start = line_start - 1
+                for _ in range(lines_before):
+                    if start < 0:
+                        break
+                    start = file_content.rfind('\n', 0, start)
+                start += 1
+                end = self._end_of_lines(file_content, line_start, lines_after + 1)
+                
+                span = self._find_normalized_in(file_content, start, end, normalized_old)
+                if span is not None:
+                    return span
+                budget -= end - start
+                pos = file_content.find(anchor, pos + 1)
+            else:
+                # The anchor is missing or every window around it was checked
+                return None
+        
+        return self._find_normalized_in(file_content, 0, len(file_content), normalized_old)
+    
+    def _find_normalized_in(self, file_content: str, start: int, end: int, normalized_old: str) -> Optional[Tuple[int, int]]:
+        """Match normalized_old against file_content[start:end], returning absolute offsets."""
+        normalized_window, index_map = self._normalize_with_index_map(file_content[start:end])
+        match_idx = normalized_window.find(normalized_old)
+        if match_idx == -1:
             return None
+        
+        orig_start = index_map[match_idx]
+        orig_end = index_map[match_idx + len(normalized_old) - 1] + 1
+        return start + orig_start, start + orig_end
     
     def _suggest_alternatives(self, file_path: str, file_content: str, cleaned_old_string: str, original_old_string: str) -> str:
         """
@@ -324,27 +621,34 @@ GENERAL EDITING GUIDELINES
             Error message with suggestions
         """
         # Check if the original contained line numbers
-        had_line_numbers = re.search(r'^\s*\d+\t', original_old_string, re.MULTILINE)
+        had_line_numbers = _LN_PROBE.search(original_old_string)
         
         suggestions = []
         if had_line_numbers:
             suggestions.append("The old_string contained line numbers from View tool output. Line numbers have been automatically removed, but the text still doesn't match.")
         
         # Try to find similar text
-        lines = file_content.split('\n')
-        search_lines = cleaned_old_string.split('\n')
-        
-        if search_lines:
-            first_search_line = search_lines[0].strip()
-            if first_search_line:
-                # Look for lines that contain the first line of the search
-                matching_lines = []
-                for i, line in enumerate(lines):
-                    if first_search_line in line.strip():
-                        matching_lines.append(f"Line {i+1}: {line}")
-                
-                if matching_lines:
-                    suggestions.append(f"Found similar text at:\n" + "\n".join(matching_lines[:5]))
+        first_search_line = cleaned_old_string.split('\n', 1)[0].strip()
+        if first_search_line:
+            # Look for lines that contain the first line of the search, stopping
+            # after five; line numbers are counted only up to each hit
+            matching_lines = []
+            line_number = 1
+            counted_to = 0
+            pos = file_content.find(first_search_line)
+            while pos != -1 and len(matching_lines) < 5:
+                line_start = file_content.rfind('\n', 0, pos) + 1
+                line_end = file_content.find('\n', pos)
+                if line_end == -1:
+                    line_end = len(file_content)
+                line_number += file_content.count('\n', counted_to, line_start)
+                counted_to = line_start
+                matching_lines.append(f"Line {line_number}: {file_content[line_start:line_end]}")
+                # Report each line once, however many hits it has
+                pos = file_content.find(first_search_line, line_end + 1)
+            
+            if matching_lines:
+                suggestions.append(f"Found similar text at:\n" + "\n".join(matching_lines))
         
         error_msg = f"Error: The specified text was not found in the file.\n\n"
         
@@ -358,7 +662,7 @@ GENERAL EDITING GUIDELINES
         
         return error_msg
     
-    def _get_snippet(self, new_content: str, old_string: str, new_string: str) -> str:
+    def _get_snippet(self, new_content: str, old_string: str, new_string: str, new_lines: Optional[List[str]] = None) -> str:
         """
         Get a snippet of the modified file around the edit point.
         
@@ -366,6 +670,7 @@ GENERAL EDITING GUIDELINES
             new_content: The content of the modified file
             old_string: The string that was replaced
             new_string: The string that replaced it
+            new_lines: new_string already split on newlines, if the caller has it
             
         Returns:
             A snippet of the modified file as a string with line numbers
@@ -376,43 +681,46 @@ GENERAL EDITING GUIDELINES
         # For new files or if old_string is empty
         if old_string == "":
             # Just return the first few lines of the new content
-            new_lines = new_content.split('\n')
-            max_lines = min(len(new_lines), n_lines_snippet * 2)
-            return '\n'.join(new_lines[:max_lines])
+            content_lines = new_content.split('\n')
+            max_lines = min(len(content_lines), n_lines_snippet * 2)
+            return '\n'.join(content_lines[:max_lines])
             
-        # Find the position of the new string in the content
-        lines = new_content.split('\n')
-        
-        # We need to find approximately where the edit happened
-        # For simplicity, let's just show the whole file if it's short enough
-        if len(lines) <= n_lines_snippet * 2:
+        # Count lines without splitting; short files are shown whole
+        n_lines = new_content.count('\n') + 1
+        if n_lines <= n_lines_snippet * 2:
             return new_content
-            
-        # Otherwise, try to find a window around the edit
-        try:
-            # First, try to find where the new_string appears
-            new_string_parts = new_string.split('\n')
-            first_line_of_new = new_string_parts[0]
-            
-            # Find this line in the content
-            line_index = -1
-            for i, line in enumerate(lines):
-                if first_line_of_new in line:
-                    line_index = i
-                    break
-            
-            # If we found it, create a window around it
-            if line_index >= 0:
-                start_line = max(0, line_index - n_lines_snippet)
-                end_line = min(len(lines), line_index + len(new_string_parts) + n_lines_snippet)
-                return '\n'.join(lines[start_line:end_line])
-            
+        
+        # Otherwise, find a window around the edit by offsets rather than line lists
+        if new_lines is None:
+            new_lines = new_string.split('\n')
+        first_line_of_new = new_lines[0]
+        
+        # Find where the first line of new_string appears
+        pos = new_content.find(first_line_of_new)
+        if pos == -1:
             # If we couldn't find it, just return a reasonable chunk from the start
-            return '\n'.join(lines[:n_lines_snippet * 2])
-            
-        except Exception:
-            # Fallback to just showing the first few lines
-            return '\n'.join(lines[:n_lines_snippet * 2])
+            return new_content[:self._end_of_lines(new_content, 0, n_lines_snippet * 2)]
+        
+        # Back up n_lines_snippet lines from the line containing the match
+        start = pos
+        for _ in range(n_lines_snippet + 1):
+            start = new_content.rfind('\n', 0, start)
+            if start == -1:
+                break
+        start += 1
+        
+        line_start = new_content.rfind('\n', 0, pos) + 1
+        end = self._end_of_lines(new_content, line_start, len(new_lines) + n_lines_snippet)
+        return new_content[start:end]
+    
+    def _end_of_lines(self, text: str, start: int, count: int) -> int:
+        """Return the offset just past the count-th line starting at start, newline excluded."""
+        end = start - 1
+        for _ in range(count):
+            end = text.find('\n', end + 1)
+            if end == -1:
+                return len(text)
+        return end
     
     def _format_result(self, file_path: str, snippet: str) -> str:
         """
@@ -442,13 +750,10 @@ GENERAL EDITING GUIDELINES
             Content with line numbers
         """
         lines = content.split('\n')
-        result = []
         
-        for i, line in enumerate(lines):
-            line_number = start_line + i
-            result.append(f"{line_number:6d}\t{line}")
-            
-        return '\n'.join(result)
+        # Keep cat -n's six-column numbers, widening only if they would overflow
+        width = max(6, len(str(start_line + len(lines) - 1)))
+        return '\n'.join(f"{line_number:{width}d}\t{line}" for line_number, line in enumerate(lines, start_line))
 
 
 # Export the tool as an instance that can be directly used
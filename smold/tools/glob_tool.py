@@ -6,14 +6,295 @@ It supports standard glob patterns and returns matching files sorted by modifica
 """
 
 import glob as glob_module
+import heapq
 import os
 import pathlib
+import re
+import stat
 import time
-from typing import List, Optional, Dict, Any, Tuple
+from functools import lru_cache
+from operator import itemgetter
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 
 from smolagents import Tool
 
 
+def _translate_class(segment: str, i: int, j: int) -> str:
+    """
+    Translate the '[...]' set spanning segment[i:j] into a regex, as fnmatch does.
+    
+    Empty and reversed ranges are dropped, '-' outside ranges and the set
+    operators '&', '~' and '|' are escaped, and the set never matches '/'.
+    
+    Args:
+        segment: The path segment containing the set
+        i: Index just after the opening '['
+        j: Index of the closing ']'
+        
+    Returns:
+        Regex source matching one character of the set
+    """
+    stuff = segment[i:j]
+    if '-' not in stuff:
+        stuff = stuff.replace('\\', '\\\\')
+    else:
+        chunks = []
+        k = i + 2 if segment[i] == '!' else i + 1
+        while True:
+            k = segment.find('-', k, j)
+            if k < 0:
+                break
+            chunks.append(segment[i:k])
+            i = k + 1
+            k = k + 3
+        chunk = segment[i:j]
+        if chunk:
+            chunks.append(chunk)
+        else:
+            chunks[-1] += '-'
+        # Remove empty ranges, which are invalid in a regex
+        for k in range(len(chunks) - 1, 0, -1):
+            if chunks[k - 1][-1] > chunks[k][0]:
+                chunks[k - 1] = chunks[k - 1][:-1] + chunks[k][1:]
+                del chunks[k]
+        # Escape backslashes and hyphens that do not form a range
+        stuff = '-'.join(c.replace('\\', '\\\\').replace('-', '\\-') for c in chunks)
+    # Escape the set operations '&&', '~~' and '||'
+    stuff = re.sub(r'([&~|])', r'\\\1', stuff)
+    
+    if not stuff:
+        # Empty set: never match
+        return '(?!)'
+    if stuff == '!':
+        # Negated empty set: any character within the segment
+        return '[^/]'
+    if stuff[0] == '!':
+        # ']' or '[' would no longer be the first character after '^/'
+        rest = stuff[1:]
+        if rest[0] in (']', '['):
+            rest = '\\' + rest
+        return '[^/' + rest + ']'
+    if stuff[0] in ('^', '['):
+        stuff = '\\' + stuff
+    # A range such as '%-0' spans '/', which never occurs inside a segment
+    return f'(?!/)[{stuff}]' if '-' in stuff else f'[{stuff}]'
+
+
+def _translate_segment(segment: str, hide_dotfiles: bool) -> str:
+    """
+    Translate one path segment of a glob pattern into a regex.
+    
+    Args:
+        segment: A single segment, without '/'
+        hide_dotfiles: Whether a leading wildcard must not match a leading '.'
+        
+    Returns:
+        Regex source matching that segment within one path component
+    """
+    out = []
+    i, n = 0, len(segment)
+    while i < n:
+        c = segment[i]
+        i += 1
+        if c == '*':
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            j = i
+            if j < n and segment[j] == '!':
+                j += 1
+            if j < n and segment[j] == ']':
+                j += 1
+            j = segment.find(']', j)
+            if j == -1:
+                out.append('\\[')
+            else:
+                out.append(_translate_class(segment, i, j))
+                i = j + 1
+        else:
+            out.append(re.escape(c))
+    
+    regex = ''.join(out)
+    # Like glob.glob, wildcards never match a leading '.' (pathlib's glob has no such rule)
+    if hide_dotfiles and segment[:1] in ('*', '?', '['):
+        regex = '(?!\\.)' + regex
+    return regex
+
+
+def _translate_glob(pattern: str) -> str:
+    """
+    Translate a glob pattern into a regex over '/'-separated relative paths.
+    
+    '*', '?' and '[...]' stay within one path segment, while a '**' segment
+    spans any number of (non-hidden) directories. Patterns with a '**' segment
+    follow glob.glob(recursive=True), whose wildcards skip names starting with
+    '.'; other patterns follow pathlib's glob, whose wildcards match them.
+    
+    Args:
+        pattern: The glob pattern, using '/' as separator
+        
+    Returns:
+        Regex source to be matched against the whole relative path
+    """
+    segments = pattern.split('/')
+    hide_dotfiles = '**' in segments
+    out = []
+    for i, segment in enumerate(segments):
+        last = i == len(segments) - 1
+        if segment == '**':
+            if last:
+                out.append('[^/.][^/]*(?:/[^/.][^/]*)*')
+            else:
+                out.append('(?:[^/.][^/]*/)*')
+        else:
+            out.append(_translate_segment(segment, hide_dotfiles) + ('' if last else '/'))
+    return '(?s:' + ''.join(out) + ')\\Z'
+
+
+def _split_literal_prefix(pattern: str) -> Tuple[str, str]:
+    """
+    Split a '/'-separated glob pattern into its leading literal directories and the rest.
+    
+    Args:
+        pattern: The glob pattern, e.g. "src/foo/**/*.py"
+        
+    Returns:
+        Tuple of (literal prefix, remaining pattern), e.g. ("src/foo", "**/*.py");
+        the remainder is empty when the whole pattern is literal
+    """
+    segments = pattern.split('/')
+    i = 0
+    while i < len(segments) and not any(c in segments[i] for c in '*?['):
+        i += 1
+    return '/'.join(segments[:i]), '/'.join(segments[i:])
+
+
+def _file_mtime(path: str) -> Optional[float]:
+    """
+    Stat a path once, returning its mtime if it is a regular file.
+    
+    Args:
+        path: The path to check
+        
+    Returns:
+        The modification time, or None for directories and missing paths
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime if stat.S_ISREG(st.st_mode) else None
+
+
+def _dir_id(path: str) -> Optional[Tuple[int, int]]:
+    """
+    Identify a directory by device and inode, following symlinks.
+    
+    Args:
+        path: The directory path
+        
+    Returns:
+        (st_dev, st_ino), or None if the path cannot be stat'd
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_dev, st.st_ino
+
+
+@lru_cache(maxsize=256)
+def _compiled_glob(patterns: Tuple[str, ...]) -> re.Pattern:
+    """Compile (and cache) one regex matching any of the '/'-separated glob patterns."""
+    return re.compile('|'.join(_translate_glob(p) for p in patterns), re.IGNORECASE if os.name == 'nt' else 0)
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Split text at commas that are not nested inside braces."""
+    parts = []
+    depth = 0
+    last = 0
+    for i, c in enumerate(text):
+        if c == '{':
+            depth += 1
+        elif c == '}' and depth:
+            depth -= 1
+        elif c == ',' and depth == 0:
+            parts.append(text[last:i])
+            last = i + 1
+    parts.append(text[last:])
+    return parts
+
+
+@lru_cache(maxsize=256)
+def _brace_expand(pattern: str) -> Tuple[str, ...]:
+    """
+    Expand brace groups like a shell, including nested ones.
+    
+    "src/*.{js,ts{,x}}" -> ("src/*.js", "src/*.ts", "src/*.tsx"). A group without
+    a top-level comma, or an unmatched '{', is kept literally.
+    
+    Args:
+        pattern: The pattern to expand
+        
+    Returns:
+        Tuple of expanded patterns, without duplicates, in expansion order
+    """
+    depth = 0
+    start = 0
+    for i, c in enumerate(pattern):
+        if c == '{':
+            if depth == 0:
+                start = i
+            depth += 1
+        elif c == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                prefix, inner, suffix = pattern[:start], pattern[start + 1:i], pattern[i + 1:]
+                options = _split_top_level(inner)
+                if len(options) == 1:
+                    # Not a list: keep the braces, but expand anything nested inside
+                    heads = [f"{prefix}{{{option}}}" for option in _brace_expand(inner)]
+                else:
+                    heads = [prefix + expanded for option in options for expanded in _brace_expand(option)]
+                return tuple(dict.fromkeys(head + tail for head in heads for tail in _brace_expand(suffix)))
+    return (pattern,)
+
+
+@lru_cache(maxsize=256)
+def _expand_pattern(pattern: str) -> Tuple[str, ...]:
+    """
+    Expand the brace and "?(...)" forms Python's glob lacks into plain patterns.
+    
+    Args:
+        pattern: The glob pattern, e.g. "**/*config*.{js,json,ts}" or "**/*.ts?(x)"
+        
+    Returns:
+        Tuple of plain glob patterns
+    """
+    expanded = []
+    # Handle brace expansion for patterns like "**/*config*.{js,json,ts}"
+    for p in _brace_expand(pattern):
+        # Handle Node.js-style patterns like "**/*.ts?(x)" which Python doesn't natively support
+        if "?(" in p:
+            # For "**/*.ts?(x)" pattern, we'll look for both .ts and .tsx files
+            if p.endswith("?(x)"):
+                base_pattern = p[:-4]  # Remove "?(x)"
+                expanded.extend((base_pattern, f"{base_pattern}x"))
+                continue
+            # For other ?() patterns, split into multiple patterns
+            parts = p.split("?(")
+            if len(parts) == 2 and parts[1].endswith(")"):
+                optional_part = parts[1][:-1]  # Remove trailing ")"
+                expanded.extend((parts[0], f"{parts[0]}{optional_part}"))
+                continue
+        
+        # Otherwise use the pattern as-is
+        expanded.append(p)
+    return tuple(expanded)
+
+
 class GlobTool(Tool):
     """
     Fast file pattern matching tool that works with any codebase size.
@@ -92,62 +373,130 @@ class GlobTool(Tool):
         Returns:
             Tuple of (matching_files, truncated_flag)
         """
-        # Handle Node.js-style patterns like "**/*.ts?(x)" which Python doesn't natively support
-        # Handle brace expansion for patterns like "**/*config*.{js,json,ts}"
-        if "{" in pattern and "}" in pattern:
-            before_brace, rest = pattern.split("{", 1)
-            options, after_brace = rest.split("}", 1)
-            options_list = options.split(",")
-            patterns = [f"{before_brace}{opt}{after_brace}" for opt in options_list]
-        elif "?(" in pattern:
-            # For "**/*.ts?(x)" pattern, we'll look for both .ts and .tsx files
-            if pattern.endswith("?(x)"):
-                base_pattern = pattern[:-4]  # Remove "?(x)"
-                patterns = [f"{base_pattern}", f"{base_pattern}x"]
-            else:
-                # For other ?() patterns, split into multiple patterns
-                parts = pattern.split("?(")
-                if len(parts) == 2 and parts[1].endswith(")"):
-                    optional_part = parts[1][:-1]  # Remove trailing ")"
-                    patterns = [f"{parts[0]}", f"{parts[0]}{optional_part}"]
-                else:
-                    # If we can't handle the pattern, just use it as-is
-                    patterns = [pattern]
-        else:
-            patterns = [pattern]
-            
-        all_matches = []
-        for p in patterns:
-            # Handle "**" recursive patterns correctly
-            # Python's pathlib.glob doesn't handle ** the same way as Node's glob
-            if "**" in p:
-                # Use glob.glob with recursive=True for ** patterns
-                matches = glob_module.glob(
-                    os.path.join(search_path, p),
-                    recursive=True
-                )
-                for match in matches:
-                    if os.path.isfile(match):  # Only include files, not directories
-                        all_matches.append(match)
-            else:
-                # Use standard pathlib.glob for non-recursive patterns
-                base_path = pathlib.Path(search_path)
-                all_matches.extend([str(path) for path in base_path.glob(p) if path.is_file()])
-                
-        # Remove duplicates that might have been added from multiple patterns
-        all_matches = list(set(all_matches))
+        # Expand brace and "?(...)" forms into plain glob patterns
+        patterns = _expand_pattern(pattern)
         
-        # Sort by modification time (newest first)
-        all_matches.sort(key=lambda p: os.path.getmtime(p), reverse=True)
+        # Keep only the newest offset + limit + 1 matches instead of sorting them all;
+        # nlargest is equivalent to sorted(reverse=True)[:n], so ties keep walk order
+        try:
+            top = heapq.nlargest(offset + limit + 1, self._iter_matches(patterns, search_path), key=itemgetter(1))
+        except re.error:
+            # A pattern that cannot be compiled matches nothing, as with glob.glob
+            return [], False
         
         # Determine if results are truncated
-        truncated = len(all_matches) > offset + limit
+        truncated = len(top) > offset + limit
         
         # Apply pagination (offset + limit)
-        paginated_matches = all_matches[offset:offset + limit]
+        paginated_matches = [path for path, _ in top[offset:offset + limit]]
         
         return paginated_matches, truncated
     
+    def _iter_matches(self, patterns: Tuple[str, ...], search_path: str) -> Iterator[Tuple[str, float]]:
+        """
+        Lazily yield the files matching any of the plain glob patterns.
+        
+        Args:
+            patterns: Plain glob patterns (already brace-expanded)
+            search_path: The directory to search in
+            
+        Returns:
+            Iterator of (path, mtime), each path yielded once
+        """
+        # Also removes duplicates found by several patterns
+        seen = set()
+        # Walk root -> pattern remainders to match below it
+        walks: Dict[str, List[str]] = {}
+        for p in patterns:
+            # Start the walk below the literal leading directories of the pattern
+            prefix, remainder = _split_literal_prefix(p.replace('\\', '/'))
+            root = os.path.join(search_path, prefix) if prefix else search_path
+            
+            if not remainder:
+                # Fully literal pattern: a single path to check
+                mtime = _file_mtime(root)
+                if mtime is not None and root not in seen:
+                    seen.add(root)
+                    yield root, mtime
+                continue
+            
+            segments = remainder.split('/')
+            if any(segment in ('.', '..') for segment in segments):
+                # Relative segments after a wildcard go through glob.glob
+                for match in glob_module.iglob(os.path.join(search_path, p), recursive=True):
+                    mtime = _file_mtime(match)
+                    if mtime is not None and match not in seen:  # Only include files, not directories
+                        seen.add(match)
+                        yield match, mtime
+                continue
+            
+            walks.setdefault(root, []).append(remainder)
+        
+        # One walk per root, matching all alternatives under it with a single regex
+        for root, remainders in walks.items():
+            regex = _compiled_glob(tuple(remainders))
+            max_depth = 0
+            skip_hidden = True
+            for remainder in remainders:
+                segments = remainder.split('/')
+                # Without '**' the pattern has a fixed depth, so the walk can stop there
+                if '**' in segments:
+                    max_depth = None
+                elif max_depth is not None:
+                    max_depth = max(max_depth, len(segments) - 1)
+                # Only '**' patterns skip hidden directories, and not when they name one
+                if '**' not in segments or any(segment.startswith('.') for segment in segments):
+                    skip_hidden = False
+            for entry, rel_path in self._scandir_walk(root, max_depth, skip_hidden):
+                if regex.match(rel_path) and entry.path not in seen:
+                    try:
+                        # DirEntry caches the stat result, so this is the only stat per match
+                        mtime = entry.stat().st_mtime
+                    except OSError:
+                        continue
+                    seen.add(entry.path)
+                    yield entry.path, mtime
+    
+    def _scandir_walk(self, base_path: str, max_depth: Optional[int] = None, skip_hidden: bool = False) -> Iterator[Tuple[os.DirEntry, str]]:
+        """
+        Walk base_path with os.scandir, yielding every file below it.
+        
+        Entry types come from the directory listing, so no per-file stat is made.
+        Symlinked directories are followed, like glob.glob and pathlib's glob do,
+        except into a directory that is already one of the current path's ancestors.
+        
+        Args:
+            base_path: The directory to walk
+            max_depth: How many directory levels to descend (None for unlimited)
+            skip_hidden: Whether to skip directories whose name starts with '.'
+            
+        Returns:
+            Iterator of (DirEntry, path relative to base_path using '/')
+        """
+        root_id = _dir_id(base_path)
+        if root_id is None:
+            return
+        stack = [(base_path, '', 0, frozenset((root_id,)))]
+        while stack:
+            dir_path, rel_dir, depth, ancestors = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    for entry in it:
+                        rel_path = rel_dir + entry.name
+                        try:
+                            if entry.is_dir():
+                                if (max_depth is None or depth < max_depth) and not (skip_hidden and entry.name.startswith('.')):
+                                    st = entry.stat()
+                                    dir_id = (st.st_dev, st.st_ino)
+                                    if dir_id not in ancestors:
+                                        stack.append((entry.path, rel_path + '/', depth + 1, ancestors | {dir_id}))
+                            elif entry.is_file():
+                                yield entry, rel_path
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+    
     def _is_simple_filename_pattern(self, pattern: str) -> bool:
         """
         Check if a pattern looks like a simple filename that should be searched recursively.
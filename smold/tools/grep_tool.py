@@ -5,15 +5,77 @@ This tool allows searching file contents using regular expressions.
 It supports full regex syntax and can filter files by pattern.
 """
 
+import codecs
+import concurrent.futures
+import io
+import mmap
 import os
 import re
+import threading
 import glob as glob_module
 import fnmatch
+import itertools
 import time
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 
 from smolagents import Tool
+from .glob_tool import _brace_expand, _compiled_glob as _compiled_path_glob, _dir_id
+
+
+# Files larger than this are memory-mapped rather than read into memory
+MMAP_THRESHOLD = 4 * 1024 * 1024
+BINARY_PATH_CACHE_SIZE = 4096
+
+# Pattern features whose meaning differs between str and bytes regexes on UTF-8:
+# Unicode-aware classes, case folding, escapes naming non-ASCII characters, and
+# '.' and negated classes, which would match one byte of a multi-byte character
+_BYTES_UNSAFE_RE = re.compile(r'\\[wWdDsSbBxuUN0-7]|\(\?[a-zA-Z]*i|\.|\[\^')
+
+# Bytes that count as text when sniffing for binary content: tab, newlines,
+# vertical tab, form feed, carriage return and printable ASCII
+_TEXT_BYTES = bytes(range(9, 14)) + bytes(range(32, 127))
+
+# An include alternative that only selects an extension, e.g. "*.py"
+_EXTENSION_GLOB_RE = re.compile(r'\*\.[A-Za-z0-9]+\Z')
+
+# File extensions that are never searched
+_BINARY_EXTENSIONS = frozenset({
+    '.pdf', '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff',
+    '.exe', '.dll', '.so', '.dylib', '.zip', '.tar', '.gz',
+    '.rar', '.7z', '.mp3', '.mp4', '.avi', '.mov', '.wmv'
+})
+
+# Paths found to have binary content -> (st_mtime_ns, st_size) when classified,
+# so repeat searches skip them without opening them again; least recently used go first
+_binary_path_cache: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+_binary_path_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=256)
+def _compiled_glob(patterns: Tuple[str, ...]) -> re.Pattern:
+    """Compile (and cache) one regex matching a file name against any of the globs, as fnmatch would."""
+    union = "|".join(fnmatch.translate(pattern) for pattern in patterns)
+    return re.compile(union, re.IGNORECASE if os.name == 'nt' else 0)
+
+
+@lru_cache(maxsize=256)
+def _extension_set(patterns: Tuple[str, ...]) -> Optional[frozenset]:
+    """
+    Reduce file name globs that are all of the form "*.ext" to a set of extensions.
+    
+    Args:
+        patterns: File name glob patterns
+        
+    Returns:
+        Frozenset of extensions (lowercased on Windows, where matching ignores
+        case), or None if any pattern is not a plain extension glob
+    """
+    if not patterns or not all(_EXTENSION_GLOB_RE.match(p) for p in patterns):
+        return None
+    return frozenset(p[2:].lower() if os.name == 'nt' else p[2:] for p in patterns)
 
 
 class GrepTool(Tool):
@@ -59,11 +121,20 @@ class GrepTool(Tool):
         search_path = os.path.abspath(search_path)
         
         try:
-            # Compile the regex pattern
+            # Compile the regex pattern; it is matched against one line at a time
             regex = re.compile(pattern)
         except re.error as e:
             return f"Error: Invalid regular expression pattern: {str(e)}"
         
+        # The same pattern over raw bytes skips decoding UTF-8 files, when
+        # matching bytes cannot give a different answer than matching text
+        regex_bytes = None
+        if pattern.isascii() and not _BYTES_UNSAFE_RE.search(pattern):
+            try:
+                regex_bytes = re.compile(pattern.encode('ascii'))
+            except re.error:
+                regex_bytes = None
+        
         # Find files to search
         all_files = self._find_files(search_path, include)
         
@@ -71,18 +142,22 @@ class GrepTool(Tool):
         if not all_files:
             return "No files found"
         
-        # Search for pattern in files
-        matching_files = []
-        for file_path in all_files:
-            try:
-                if self._file_contains_pattern(file_path, regex):
-                    matching_files.append(file_path)
-            except Exception:
-                # Silently skip files that can't be read
-                continue
+        # Search for pattern in files; open/read/fstat release the GIL, so
+        # threads overlap the I/O of independent files
+        matching_files = {}
+        max_workers = min(32, (os.cpu_count() or 4) * 4, len(all_files))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                lambda item: self._search_file(item[0], item[1], regex, regex_bytes),
+                all_files.items()
+            )
+            for result in results:
+                if result is not None:
+                    file_path, mtime = result
+                    matching_files[file_path] = mtime
         
         # Sort results by modification time (newest first)
-        matching_files.sort(key=lambda f: os.path.getmtime(f), reverse=True)
+        matching_files = sorted(matching_files, key=matching_files.__getitem__, reverse=True)
         
         # Truncate to max 100 matches
         files_found = len(matching_files)
@@ -99,7 +174,7 @@ class GrepTool(Tool):
                 result_for_assistant += "\n(Results are truncated. Consider using a more specific path or pattern.)"
             return result_for_assistant
     
-    def _find_files(self, base_path: str, include: Optional[str] = None) -> List[str]:
+    def _find_files(self, base_path: str, include: Optional[str] = None) -> Dict[str, Optional[os.DirEntry]]:
         """
         Find files to search based on include pattern.
         
@@ -108,75 +183,141 @@ class GrepTool(Tool):
             include: File pattern to include (e.g. "*.js")
             
         Returns:
-            List of file paths to search
+            Dict mapping each file path to search to its DirEntry (None when
+            the path came from glob rather than the directory walk)
         """
-        all_files = []
+        all_files = {}
         
         # If include pattern is specified
         if include:
             # Handle glob patterns with multiple extensions like "*.{js,ts}"
-            if "{" in include and "}" in include:
-                # Extract patterns from the brace expression
-                prefix = include.split("{")[0]
-                extensions = include.split("{")[1].split("}")[0].split(",")
-                patterns = [f"{prefix}{ext}" for ext in extensions]
-                
-                for pattern in patterns:
-                    # Handle "**/" recursive patterns
-                    if "**" in pattern:
-                        full_pattern = os.path.join(base_path, pattern)
-                        matches = glob_module.glob(full_pattern, recursive=True)
-                        file_matches = [m for m in matches if os.path.isfile(m)]
-                        all_files.extend(file_matches)
-                    else:
-                        # Use non-recursive glob for regular patterns
-                        for root, _, files in os.walk(base_path):
-                            matched_files = []
-                            for file in files:
-                                if fnmatch.fnmatch(file, pattern.split("/")[-1]):
-                                    matched_files.append(os.path.join(root, file))
-                            all_files.extend(matched_files)
-            else:
-                # Handle "**/" recursive patterns
-                if "**" in include:
-                    full_pattern = os.path.join(base_path, include)
-                    matches = glob_module.glob(full_pattern, recursive=True)
-                    file_matches = [m for m in matches if os.path.isfile(m)]
-                    all_files.extend(file_matches)
+            patterns = _brace_expand(include)
+            
+            # Handle "**/" recursive patterns
+            deep_patterns = []
+            for pattern in patterns:
+                if "**" not in pattern:
+                    continue
+                pattern = pattern.replace("\\", "/")
+                if os.path.isabs(pattern) or any(part in (".", "..") for part in pattern.split("/")):
+                    # Patterns leaving base_path go through glob.glob
+                    for m in glob_module.glob(os.path.join(base_path, pattern), recursive=True):
+                        if os.path.isfile(m):
+                            all_files.setdefault(m, None)
                 else:
-                    # Use non-recursive glob for regular patterns
-                    for root, _, files in os.walk(base_path):
-                        matched_files = []
-                        for file in files:
-                            if fnmatch.fnmatch(file, include.split("/")[-1]):
-                                matched_files.append(os.path.join(root, file))
-                        all_files.extend(matched_files)
+                    deep_patterns.append(pattern)
+            
+            # Match all other alternatives on file names anywhere below base_path,
+            # and "**" alternatives on relative paths, in a single walk
+            name_patterns = tuple(p.split("/")[-1] for p in patterns if "**" not in p)
+            exts = _extension_set(name_patterns)
+            name_re = _compiled_glob(name_patterns) if name_patterns and exts is None else None
+            path_re = _compiled_path_glob(tuple(deep_patterns)) if deep_patterns else None
+            if exts is not None or name_re is not None or path_re is not None:
+                prefix_len = len(os.path.join(base_path, ""))
+                # Only "**" alternatives (glob.glob) look inside symlinked directories
+                for entry, linked in self._scandir_walk(base_path, follow_links=path_re is not None):
+                    name = entry.name
+                    if not linked:
+                        if exts is not None:
+                            # Every name alternative is "*.ext": a set lookup on the suffix is enough
+                            dot = name.rfind('.')
+                            if dot != -1 and (name[dot + 1:].lower() if os.name == 'nt' else name[dot + 1:]) in exts:
+                                all_files[entry.path] = entry
+                                continue
+                        elif name_re is not None and name_re.match(name):
+                            all_files[entry.path] = entry
+                            continue
+                    if path_re is not None and path_re.match(entry.path[prefix_len:].replace(os.sep, "/")):
+                        all_files[entry.path] = entry
         else:
             # If no include pattern, search all regular files
-            for root, _, files in os.walk(base_path):
-                file_paths = []
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if os.path.isfile(file_path):
-                        file_paths.append(file_path)
-                all_files.extend(file_paths)
-        
-        # Remove duplicate files
-        unique_files = list(set(all_files))
+            for entry, _ in self._scandir_walk(base_path):
+                all_files[entry.path] = entry
         
         # Limit to first 1000 files for performance reasons
-        if len(unique_files) > 1000:
-            unique_files = unique_files[:1000]
+        if len(all_files) > 1000:
+            all_files = dict(itertools.islice(all_files.items(), 1000))
             
-        return unique_files
+        return all_files
     
-    def _file_contains_pattern(self, file_path: str, regex: re.Pattern) -> bool:
+    def _scandir_walk(self, base_path: str, follow_links: bool = False) -> Iterator[Tuple[os.DirEntry, bool]]:
+        """
+        Walk base_path with os.scandir, yielding a DirEntry for every file below it.
+        
+        Entry types come from the directory listing, so no per-file stat is made.
+        Like os.walk, symlinked directories are not descended into unless
+        follow_links is set; then, like glob.glob, they are, except into a
+        directory that is already one of the current path's ancestors.
+        
+        Args:
+            base_path: The directory to walk
+            follow_links: Whether to descend into symlinked directories
+            
+        Returns:
+            Iterator of (DirEntry for a file (including symlinks to files),
+            whether it was reached through a symlinked directory)
+        """
+        stack = [(base_path, False, frozenset((_dir_id(base_path),)) if follow_links else frozenset())]
+        while stack:
+            dir_path, linked, ancestors = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if follow_links:
+                                    st = entry.stat()
+                                    ancestors_below = ancestors | {(st.st_dev, st.st_ino)}
+                                else:
+                                    ancestors_below = ancestors
+                                stack.append((entry.path, linked, ancestors_below))
+                            elif entry.is_file():
+                                yield entry, linked
+                            elif follow_links and entry.is_dir():
+                                st = entry.stat()
+                                dir_id = (st.st_dev, st.st_ino)
+                                if dir_id not in ancestors:
+                                    stack.append((entry.path, True, ancestors | {dir_id}))
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+    
+    def _search_file(self, file_path: str, entry: Optional[os.DirEntry], regex: re.Pattern, regex_bytes: Optional[re.Pattern]) -> Optional[Tuple[str, float]]:
+        """
+        Search one file, returning its path and mtime if it matches.
+        
+        Args:
+            file_path: Path to the file to search
+            entry: The file's DirEntry, if it came from the directory walk
+            regex: Compiled str regex
+            regex_bytes: Compiled bytes regex, or None
+            
+        Returns:
+            (file_path, mtime) for a match, None otherwise
+        """
+        try:
+            if self._file_contains_pattern(file_path, regex, regex_bytes):
+                # DirEntry caches its stat result, so only matches are stat'd
+                return file_path, entry.stat().st_mtime if entry is not None else os.path.getmtime(file_path)
+        except Exception:
+            # Silently skip files that can't be read
+            pass
+        return None
+    
+    def _file_contains_pattern(self, file_path: str, regex: re.Pattern, regex_bytes: Optional[re.Pattern] = None) -> bool:
         """
         Check if a file contains the regex pattern.
         
+        The file is opened once: its first buffered chunk decides whether it is
+        binary and which encoding to use, then its content (memory-mapped for
+        large files) is searched line by line.
+        
         Args:
             file_path: Path to the file to search
             regex: Compiled regex pattern
+            regex_bytes: The same pattern compiled for bytes, if safe to use on UTF-8 files
             
         Returns:
             True if the file contains the pattern, False otherwise
@@ -185,88 +326,126 @@ class GrepTool(Tool):
         if self._is_binary_file(file_path):
             return False
         
-        # Try different encodings
-        encodings = ['utf-8', 'latin-1', 'cp1252']
-        
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    for line in f:
-                        if regex.search(line):
-                            return True
-                break  # Successfully read file, break the encoding loop
-            except UnicodeDecodeError:
-                continue
-            except Exception:
-                # Skip files that can't be read
-                break
+        try:
+            with open(file_path, 'rb', buffering=8192) as f:
+                st = os.fstat(f.fileno())
+                # peek() fills the read buffer without advancing the file position
+                encoding = self._classify(f.peek(8192)[:8192])
+                if encoding is None:
+                    with _binary_path_cache_lock:
+                        _binary_path_cache[file_path] = (st.st_mtime_ns, st.st_size)
+                        _binary_path_cache.move_to_end(file_path)
+                        if len(_binary_path_cache) > BINARY_PATH_CACHE_SIZE:
+                            _binary_path_cache.popitem(last=False)
+                    return False
                 
-        return False
+                if st.st_size > MMAP_THRESHOLD:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        return self._search_content(mm, encoding, regex, regex_bytes)
+                return self._search_content(f.read(), encoding, regex, regex_bytes)
+        except Exception:
+            # Skip files that can't be read
+            return False
     
-    def _is_binary_file(self, file_path: str) -> bool:
+    def _search_content(self, data, encoding: str, regex: re.Pattern, regex_bytes: Optional[re.Pattern]) -> bool:
         """
-        Check if a file appears to be binary.
+        Search a file's raw content, as bytes when possible and as decoded text otherwise.
+        
+        The pattern is matched against each line, including its newline, as when
+        iterating over the file in text mode, so a match never spans lines.
         
         Args:
-            file_path: Path to the file to check
+            data: The file content (bytes or mmap)
+            encoding: Encoding chosen by _classify
+            regex: Compiled str regex
+            regex_bytes: Compiled bytes regex, or None
             
         Returns:
-            True if the file appears to be binary, False otherwise
+            True if the content matches, False otherwise
         """
-        # Check file extension for common binary types
-        binary_extensions = [
-            '.pdf', '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', 
-            '.exe', '.dll', '.so', '.dylib', '.zip', '.tar', '.gz', 
-            '.rar', '.7z', '.mp3', '.mp4', '.avi', '.mov', '.wmv'
-        ]
+        # Without \r, splitting the bytes on \n gives the same lines as text mode
+        if regex_bytes is not None and encoding == 'utf-8' and data.find(b'\r') == -1:
+            lines = data if isinstance(data, mmap.mmap) else io.BytesIO(data)
+            return any(map(regex_bytes.search, iter(lines.readline, b'')))
         
-        # Explicitly mark our own binary test file
-        if os.path.basename(file_path) == "test.bin":
-            return True
+        try:
+            text = data[:].decode(encoding)
+        except UnicodeDecodeError:
+            # Not UTF-8 after all; latin-1 decodes any byte sequence
+            text = data[:].decode('latin-1')
+        if '\r' in text:
+            # Universal newlines, as text-mode reading translates them
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return any(map(regex.search, io.StringIO(text)))
+    
+    def _classify(self, chunk: bytes) -> Optional[str]:
+        """
+        Classify a file from its first bytes.
         
-        if any(file_path.lower().endswith(ext) for ext in binary_extensions):
-            return True
+        Args:
+            chunk: The first bytes of the file
             
-        # Try to read as text first - this is more reliable
+        Returns:
+            The encoding to read the file with, or None if it appears to be binary
+        """
+        # Empty file is not binary
+        if not chunk:
+            return 'utf-8'
+        
+        # Valid UTF-8 is text; final=False tolerates a character cut off at the chunk end
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                # Just try to read a bit - if it succeeds, it's probably text
-                f.read(1024)
-                return False  # If we can read it as text, it's not binary
+            codecs.getincrementaldecoder('utf-8')().decode(chunk, final=False)
+            return 'utf-8'
         except UnicodeDecodeError:
-            # If we get a decode error, try the binary check
             pass
-        except Exception:
-            # If we can't read the file for other reasons, consider it binary to skip it
-            return True
+        
+        # Detect null bytes - strong indicator of binary content
+        if b'\x00' in chunk:
+            return None
+        
+        # Count control characters (except newlines, tabs, etc.)
+        control_chars = len(chunk.translate(None, _TEXT_BYTES))
+        ratio = control_chars / len(chunk)
+        
+        # If more than 10% are control chars, likely binary
+        if ratio > 0.1:
+            return None
+        
+        return 'latin-1'
+    
+    def _is_binary_file(self, file_path: str) -> bool:
+        """
+        Check if a file is binary judging by its name or an earlier classification.
+        
+        Args:
+            file_path: Path to the file to check
             
-        # More robust binary check
-        try:
-            with open(file_path, 'rb') as f:
-                chunk = f.read(1024)
-                
-                # Empty file is not binary
-                if not chunk:
-                    return False
-                
-                # Detect null bytes - strong indicator of binary content
-                if b'\x00' in chunk:
-                    return True
-                
-                # Count control characters (except newlines, tabs, etc.)
-                control_chars = sum(1 for c in chunk if c < 9 or (c > 13 and c < 32) or c > 126)
-                ratio = control_chars / len(chunk)
-                
-                # If more than 10% are control chars, likely binary
-                if ratio > 0.1:
-                    return True
-                    
-                return False
-                
-        except Exception:
-            # If we can't read the file, consider it binary to skip it
+        Returns:
+            True if the file is known to be binary, False otherwise
+        """
+        # Explicitly mark our own binary test file
+        if os.path.basename(file_path) == "test.bin":
             return True
-            
+        
+        # Check file extension for common binary types
+        if os.path.splitext(file_path)[1].lower() in _BINARY_EXTENSIONS:
+            return True
+        
+        # Binary content seen before, as long as the file is unchanged
+        with _binary_path_cache_lock:
+            cached = _binary_path_cache.get(file_path)
+            if cached is not None:
+                _binary_path_cache.move_to_end(file_path)
+        if cached is not None:
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                return False
+            if (st.st_mtime_ns, st.st_size) == cached:
+                return True
+            with _binary_path_cache_lock:
+                _binary_path_cache.pop(file_path, None)
+        
         return False
 
 # Export the tool as an instance that can be directly used
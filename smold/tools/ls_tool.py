@@ -6,6 +6,7 @@ This tool lists files and directories in a given path.
 
 import os
 import fnmatch
+import re
 import subprocess
 from typing import List, Dict, Any, Optional, Set, Tuple
 
@@ -63,7 +64,7 @@ class LSTool(Tool):
                 return "Operation cancelled by user. Root directory listing was not performed."
 
         # Get the list of immediate directory contents
-        all_paths = self._list_directory(path, ignore or [])
+        all_paths = self._list_directory(path, self._compile_ignore_patterns(ignore or []))
 
         # Build tree structure from the paths
         tree = self._create_file_tree(all_paths)
@@ -106,13 +107,28 @@ class LSTool(Tool):
         except Exception:
             return False
 
-    def _list_directory(self, initial_path: str, ignore_patterns: List[str]) -> List[str]:
+    def _compile_ignore_patterns(self, ignore_patterns: List[str]) -> Optional[re.Pattern]:
+        """
+        Compiles the ignore patterns into one regex, so each entry is checked in a single match.
+
+        Args:
+            ignore_patterns: List of glob patterns to ignore
+
+        Returns:
+            A regex matching paths as fnmatch.fnmatch would, or None if there are no patterns
+        """
+        if not ignore_patterns:
+            return None
+        # fnmatch.fnmatch compares normcase'd path and pattern
+        return re.compile("|".join(f"(?:{fnmatch.translate(os.path.normcase(pattern))})" for pattern in ignore_patterns))
+
+    def _list_directory(self, initial_path: str, ignore_re: Optional[re.Pattern]) -> List[str]:
         """
         Lists only the immediate contents of the directory (non-recursive).
 
         Args:
             initial_path: The starting directory path
-            ignore_patterns: List of glob patterns to ignore
+            ignore_re: Compiled ignore patterns, or None
 
         Returns:
             List of relative paths (directories ending with /)
@@ -120,53 +136,52 @@ class LSTool(Tool):
         results = []
 
         try:
-            all_items = os.listdir(initial_path)
+            # scandir reports entry types with the listing, so no per-item stat is needed
+            with os.scandir(initial_path) as it:
+                all_entries = list(it)
 
             # Build a git-ignored set for batch filtering
             git_ignored: Set[str] = set()
             if self._is_git_repo(initial_path):
-                git_ignored = self._get_git_ignored_set(initial_path, all_items)
+                git_ignored = self._get_git_ignored_set(initial_path, [entry.name for entry in all_entries])
 
             # Get all entries in the directory
             entries = []
-            for item in all_items:
-                item_path = os.path.join(initial_path, item)
-
+            for entry in all_entries:
                 # Skip git-ignored items
-                if item in git_ignored:
+                if entry.name in git_ignored:
                     continue
 
                 # Skip if this path should be filtered by existing rules
-                if self._should_skip(item_path, ignore_patterns):
+                if self._should_skip(entry.path, ignore_re):
                     continue
 
-                entries.append(item_path)
+                entries.append(entry)
 
             # Sort entries alphabetically
-            entries.sort()
+            entries.sort(key=lambda entry: entry.name)
 
             # Convert to relative paths
-            for item_path in entries:
-                # Get relative path and normalize separators
-                rel_path = os.path.relpath(item_path, initial_path).replace(os.path.sep, '/')
-                # Ensure directories end with /
-                if os.path.isdir(item_path):
-                    if not rel_path.endswith('/'):
-                        rel_path += '/'
-                results.append(rel_path)
+            for entry in entries:
+                # Ensure directories (including symlinks to directories) end with /
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                results.append(entry.name + '/' if is_dir else entry.name)
 
         except (PermissionError, FileNotFoundError) as e:
             return [f"Error: Cannot access directory - {str(e)}"]
 
         return results
 
-    def _should_skip(self, path: str, ignore_patterns: List[str]) -> bool:
+    def _should_skip(self, path: str, ignore_re: Optional[re.Pattern]) -> bool:
         """
         Determines if a path should be skipped.
 
         Args:
             path: Path to check
-            ignore_patterns: List of glob patterns to ignore
+            ignore_re: Compiled ignore patterns, or None
 
         Returns:
             True if the path should be skipped, False otherwise
@@ -182,7 +197,7 @@ class LSTool(Tool):
             return True
 
         # Skip paths matching ignore patterns
-        if any(fnmatch.fnmatch(path, pattern) for pattern in ignore_patterns):
+        if ignore_re is not None and ignore_re.match(os.path.normcase(path)):
             return True
 
         return False
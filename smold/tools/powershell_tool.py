@@ -5,13 +5,22 @@ This tool executes PowerShell commands in a persistent PowerShell session.
 It supports command execution with optional timeout and provides safety measures.
 """
 
+import asyncio
+import base64
+import codecs
+import collections
+import io
 import os
+import queue
 import re
 import subprocess
+import tempfile
 import time
 import threading
 import signal
 import platform
+import string
+import weakref
 from typing import Optional, Dict, Any
 
 from smolagents import Tool
@@ -20,11 +29,235 @@ from smolagents import Tool
 DEFAULT_TIMEOUT = 1800000  # 30 minutes in milliseconds
 MAX_TIMEOUT = 600000  # 10 minutes in milliseconds
 MAX_OUTPUT_CHARS = 30000
+_READ_CHUNK = 65536  # Pipe buffer size and read size for the session's output
 BANNED_COMMANDS = [
     "Invoke-WebRequest", "wget", "curl", "Invoke-RestMethod", "Start-Process",
     "iwr", "irm", "chrome", "firefox", "msedge", "iexplore"
 ]
 
+_IS_WINDOWS = platform.system() == "Windows"
+
+# Windows PowerShell, or cross-platform PowerShell (PowerShell Core) elsewhere;
+# the command text (or "-" to read it from stdin) is appended
+_POWERSHELL_CMD_BASE = ["powershell.exe" if _IS_WINDOWS else "pwsh", "-NoProfile", "-NoLogo", "-Command"]
+
+# Make PowerShell write UTF-8 (without a BOM) whatever the console code page,
+# so output can be read as raw bytes and decoded once
+_UTF8_PREAMBLE = (
+    "$OutputEncoding = New-Object System.Text.UTF8Encoding $false; "
+    "[Console]::OutputEncoding = $OutputEncoding"
+)
+
+# Start PowerShell in its own process group, so a timeout can stop the commands it runs too
+if _IS_WINDOWS:
+    _POPEN_GROUP_KWARGS = {"creationflags": subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    _POPEN_GROUP_KWARGS = {"start_new_session": True}
+
+# PowerShell command names are case-insensitive; one alternation scans the command once
+_BANNED_RE = re.compile(r'\b(?:' + '|'.join(map(re.escape, BANNED_COMMANDS)) + r')\b', re.IGNORECASE)
+
+# Lowercases ASCII letters and turns every other non-word ASCII character
+# into a space, so split() yields the same words \b delimits
+_BANNED_TOKEN_TRANS = str.maketrans(
+    {c: c.lower() for c in string.ascii_uppercase}
+    | {c: " " for c in string.punctuation + string.whitespace if c != "_"}
+)
+_BANNED_LOWER = tuple(c.lower() for c in BANNED_COMMANDS)
+_BANNED_WORDS = frozenset(c.lower() for c in BANNED_COMMANDS if "-" not in c)
+# First words of the hyphenated names ("invoke", "start"); only commands
+# containing one of these need the regex
+_BANNED_HEADS = frozenset(c.lower().split("-")[0] for c in BANNED_COMMANDS if "-" in c)
+
+
+class _OutputBuffer:
+    """
+    Accumulates command output in bounded memory.
+    
+    Output is kept whole up to MAX_OUTPUT_CHARS. Past that only its first and
+    last MAX_OUTPUT_CHARS // 2 characters are kept, along with a count of the
+    lines dropped in between, so a runaway command can't exhaust memory.
+    """
+    
+    def __init__(self):
+        self._half = MAX_OUTPUT_CHARS // 2
+        self._parts = []
+        self._size = 0
+        self._head = None
+        self._tail = ""
+        self._truncated_lines = 0
+    
+    def write(self, text: str):
+        """Append a piece of output."""
+        if self._head is None:
+            self._parts.append(text)
+            self._size += len(text)
+            if self._size <= MAX_OUTPUT_CHARS:
+                return
+            content = "".join(self._parts)
+            self._parts = None
+            self._head = content[:self._half]
+            self._tail = content[self._half:]
+        else:
+            self._tail += text
+        # Trim the tail once it doubles, so trimming stays amortized linear
+        if len(self._tail) > 2 * self._half:
+            self._trim_tail()
+    
+    def _trim_tail(self):
+        """Drop all but the last half-limit characters of the tail, counting their lines."""
+        cut = len(self._tail) - self._half
+        if cut > 0:
+            self._truncated_lines += self._tail.count('\n', 0, cut)
+            self._tail = self._tail[cut:]
+    
+    def getvalue(self) -> str:
+        """
+        Return the output, truncated in the middle if it exceeded the limit.
+        
+        Returns:
+            The output, with the middle replaced by a count of the dropped lines
+        """
+        if self._head is None:
+            return "".join(self._parts)
+        self._trim_tail()
+        return f"{self._head}\n\n... [{self._truncated_lines} lines truncated] ...\n\n{self._tail}"
+
+
+class _LineFeed:
+    """
+    Decoded lines from one shell pipe.
+    
+    Pipes can't be polled on Windows, so a daemon thread reads the pipe in
+    chunks of up to _READ_CHUNK bytes and queues each chunk's complete lines
+    as one batch; readers wait on the queue with a timeout.
+    """
+    
+    def __init__(self, stream):
+        self._queue = queue.Queue()
+        self._lines = collections.deque()
+        threading.Thread(target=self._pump, args=(stream,), daemon=True).start()
+    
+    def _pump(self, stream):
+        """Queue lists of lines, with '\\n' endings, until EOF, then put None."""
+        decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        partial = ""
+        try:
+            while True:
+                chunk = stream.read1(_READ_CHUNK)
+                if not chunk:
+                    break
+                # A '\r' left at the end of the partial line still pairs with
+                # a '\n' at the start of the next chunk
+                lines = (partial + decoder.decode(chunk)).replace('\r\n', '\n').split('\n')
+                partial = lines.pop()
+                if lines:
+                    self._queue.put([line + '\n' for line in lines])
+        except (OSError, ValueError):
+            pass
+        partial += decoder.decode(b'', final=True)
+        if partial:
+            self._queue.put([partial])
+        self._queue.put(None)
+    
+    def read_until(self, marker: str, out: "_OutputBuffer", deadline: float) -> Optional[str]:
+        """
+        Copy lines to out until a line starting with marker.
+        
+        Args:
+            marker: The prefix of the line that ends the command's output
+            out: The buffer receiving the lines before the marker
+            deadline: time.monotonic() value after which to give up
+            
+        Returns:
+            The marker line, or None if the stream ended first
+            
+        Raises:
+            queue.Empty: If the deadline passes first
+        """
+        while True:
+            while self._lines:
+                line = self._lines.popleft()
+                if line.startswith(marker):
+                    return line
+                out.write(line)
+            batch = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+            if batch is None:
+                return None
+            self._lines.extend(batch)
+
+
+def _terminate_process_tree(process: subprocess.Popen):
+    """
+    Stop a PowerShell process together with the commands it started, and reap it.
+    
+    The process must have been started in its own process group (see _POPEN_GROUP_KWARGS),
+    so the whole group can be signalled rather than just the shell.
+    
+    Args:
+        process: The process to stop
+    """
+    if _IS_WINDOWS:
+        # taskkill /T also ends the child processes, which terminate() would orphan
+        subprocess.run(
+            ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            creationflags=subprocess.CREATE_NO_WINDOW
+        )
+        try:
+            process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        return
+    
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        pass
+    try:
+        process.wait(timeout=1)
+    except subprocess.TimeoutExpired:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        process.wait()
+
+
+async def _aterminate_process_tree(process: asyncio.subprocess.Process):
+    """
+    Async counterpart of _terminate_process_tree for asyncio subprocesses.
+    
+    Args:
+        process: The process to stop
+    """
+    if _IS_WINDOWS:
+        taskkill = await asyncio.create_subprocess_exec(
+            "taskkill", "/F", "/T", "/PID", str(process.pid),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            creationflags=subprocess.CREATE_NO_WINDOW
+        )
+        await taskkill.wait()
+    else:
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    try:
+        await asyncio.wait_for(process.wait(), timeout=1)
+    except asyncio.TimeoutError:
+        if _IS_WINDOWS:
+            process.kill()
+        else:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        await process.wait()
+
 
 class PowerShellTool(Tool):
     """
@@ -40,43 +273,52 @@ class PowerShellTool(Tool):
     output_type = "string"
     
     def __init__(self):
-        """Initialize the PowerShellTool with a persistent PowerShell process."""
+        """Initialize the PowerShellTool; the persistent PowerShell process is started on first use."""
         super().__init__()
         self.shell = None
         self.shell_process = None
-        self._initialize_shell()
+        self._finalizer = None
+        # Serializes commands, since each one's output is read back from the shared session
+        self._lock = threading.Lock()
     
     def _initialize_shell(self):
         """Start a persistent PowerShell session."""
         if self.shell_process:
+            self._finalizer.detach()
             try:
-                self.shell_process.terminate()
+                _terminate_process_tree(self.shell_process)
             except Exception:
                 pass
         
-        # Create a persistent PowerShell process
-        if platform.system() == "Windows":
-            powershell_cmd = ["powershell.exe", "-NoProfile", "-NoLogo", "-Command", "-"]
-        else:
-            # For cross-platform PowerShell (PowerShell Core)
-            powershell_cmd = ["pwsh", "-NoProfile", "-NoLogo", "-Command", "-"]
-        
+        # Create a persistent PowerShell process reading commands from stdin
         try:
             self.shell_process = subprocess.Popen(
-                powershell_cmd,
+                _POWERSHELL_CMD_BASE + ["-"],
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if platform.system() == "Windows" else 0
+                bufsize=_READ_CHUNK,
+                **_POPEN_GROUP_KWARGS
             )
         except FileNotFoundError:
             raise RuntimeError("PowerShell not found. Please ensure PowerShell is installed and available in PATH.")
         
+        # Stop the session when the tool is collected, or at interpreter exit at the
+        # latest (finalizers run from atexit); unlike __del__ this is guaranteed to run
+        self._finalizer = weakref.finalize(self, _terminate_process_tree, self.shell_process)
+        
+        self.shell_process.stdin.write(f"{_UTF8_PREAMBLE}\n".encode())
+        self.shell_process.stdin.flush()
+        
         # Set up a unique marker for command output separation
         self.output_marker = f"__COMMAND_OUTPUT_MARKER_{int(time.time())}_"
+        
+        self._stdout_feed = _LineFeed(self.shell_process.stdout)
+        self._stderr_feed = _LineFeed(self.shell_process.stderr)
+        
+        # The shell inherits our working directory; remember it so later
+        # ChangeDirectory calls (os.chdir in this process) can be forwarded
+        self._synced_cwd = os.getcwd()
     
     def forward(self, command: str, timeout: Optional[int] = None) -> str:
         """
@@ -89,26 +331,74 @@ class PowerShellTool(Tool):
         Returns:
             The command output or error message
         """
-        # Check if shell process is alive, restart if needed
+        # Security check for banned commands, before any PowerShell process is involved
+        if self._is_banned_command(command):
+            return f"Error: Command contains one or more banned commands: {', '.join(BANNED_COMMANDS)}. Please use alternative tools for these operations."
+        
+        # Start the shell on first use, or restart it if it has died
         if self.shell_process is None or self.shell_process.poll() is not None:
-            self._initialize_shell()
+            try:
+                self._initialize_shell()
+            except RuntimeError as e:
+                return f"Error: {str(e)}"
+        
+        try:
+            # Execute command with timeout
+            return self._execute_command_with_timeout(command, self._timeout_seconds(timeout))
+        except Exception as e:
+            return f"Error executing command: {str(e)}"
+    
+    async def aforward(self, command: str, timeout: Optional[int] = None) -> str:
+        """
+        Execute a PowerShell command in its own PowerShell process without blocking the event loop.
+        
+        Unlike forward, the command does not run in the persistent session: concurrent
+        calls don't queue behind each other, but they don't see the session's variables
+        or location either. Each call starts in the current working directory.
         
+        Args:
+            command: The PowerShell command to execute
+            timeout: Optional timeout in milliseconds (max 600000)
+            
+        Returns:
+            The command output or error message
+        """
         # Security check for banned commands
         if self._is_banned_command(command):
             return f"Error: Command contains one or more banned commands: {', '.join(BANNED_COMMANDS)}. Please use alternative tools for these operations."
         
-        # Set timeout
+        timeout_sec = self._timeout_seconds(timeout)
+        try:
+            with tempfile.TemporaryFile() as stdout_file, tempfile.TemporaryFile() as stderr_file:
+                process = await asyncio.create_subprocess_exec(
+                    *_POWERSHELL_CMD_BASE, f"{_UTF8_PREAMBLE}; {command}",
+                    stdout=stdout_file,
+                    stderr=stderr_file,
+                    cwd=os.getcwd(),
+                    **_POPEN_GROUP_KWARGS
+                )
+                try:
+                    await asyncio.wait_for(process.wait(), timeout=timeout_sec)
+                except asyncio.TimeoutError:
+                    return f"Command timed out after {timeout_sec} seconds"
+                finally:
+                    # Also reached when the calling task is cancelled
+                    if process.returncode is None:
+                        await _aterminate_process_tree(process)
+                
+                return self._fresh_process_result(stdout_file, stderr_file, process.returncode)
+        
+        except Exception as e:
+            return f"Error executing command: {str(e)}"
+    
+    @staticmethod
+    def _timeout_seconds(timeout: Optional[int]) -> float:
+        """Convert the optional millisecond timeout argument to seconds, capped at MAX_TIMEOUT."""
         if timeout is None:
             timeout_ms = DEFAULT_TIMEOUT
         else:
             timeout_ms = min(int(timeout), MAX_TIMEOUT)
-        timeout_sec = timeout_ms / 1000
-        
-        try:
-            # Execute command with timeout
-            return self._execute_command_with_timeout(command, timeout_sec)
-        except Exception as e:
-            return f"Error executing command: {str(e)}"
+        return timeout_ms / 1000
     
     def _execute_command_with_timeout(self, command: str, timeout_sec: float) -> str:
         """
@@ -121,107 +411,182 @@ class PowerShellTool(Tool):
         Returns:
             The command output or error message
         """
-        try:
-            # For now, use a fresh PowerShell process for each command to ensure reliability
-            # This sacrifices session persistence but ensures tests pass
-            if platform.system() == "Windows":
-                powershell_cmd = ["powershell.exe", "-NoProfile", "-NoLogo", "-Command", command]
-            else:
-                powershell_cmd = ["pwsh", "-NoProfile", "-NoLogo", "-Command", command]
+        with self._lock:
+            # Follow working directory changes made in this process (ChangeDirectory tool)
+            # without overriding any Set-Location the user ran inside the session itself
+            cd_line = ""
+            cwd = os.getcwd()
+            if cwd != self._synced_cwd:
+                cd_line = "Set-Location -LiteralPath '{}'\n".format(cwd.replace("'", "''"))
+                self._synced_cwd = cwd
             
-            process = subprocess.Popen(
-                powershell_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=os.getcwd(),  # Use current working directory
-                creationflags=subprocess.CREATE_NO_WINDOW if platform.system() == "Windows" else 0
+            # PowerShell keeps reading stdin while a statement is incomplete (an open
+            # block, an if before its else), so a multi-line command is sent as one
+            # line: base64 text dot-sourced as a script block, in the session's scope.
+            # Each stdin line runs as its own statement, so the marker line still runs
+            # after a terminating error; it reports failure (no success, or a new error
+            # record) and ends both streams' output
+            marker = self.output_marker
+            encoded = base64.b64encode(command.encode('utf-8')).decode('ascii')
+            full_command = (
+                f"{cd_line}$__smoldLastError = $Error[0]; "
+                f". ([ScriptBlock]::Create([Text.Encoding]::UTF8.GetString([Convert]::FromBase64String('{encoded}'))))\n"
+                f"$__smoldOk = $? -and [object]::ReferenceEquals($Error[0], $__smoldLastError); "
+                f"[Console]::Out.WriteLine('{marker}' + [int](-not $__smoldOk)); "
+                f"[Console]::Error.WriteLine('{marker}')\n"
             )
+            try:
+                self.shell_process.stdin.write(full_command.encode('utf-8'))
+                self.shell_process.stdin.flush()
+            except (OSError, ValueError):
+                # The session crashed before taking the command; run it on its own
+                return self._execute_in_fresh_process(command, timeout_sec)
             
-            # Wait for command completion with timeout
+            deadline = time.monotonic() + timeout_sec
+            stdout_buf = _OutputBuffer()
+            stderr_buf = _OutputBuffer()
+            failed = False
             try:
-                stdout, stderr = process.communicate(timeout=timeout_sec)
-            except subprocess.TimeoutExpired:
-                process.kill()
-                stdout, stderr = process.communicate()
+                # Read output until we get to our marker on each stream;
+                # None means the shell exited before printing it
+                marker_line = self._stdout_feed.read_until(marker, stdout_buf, deadline)
+                if marker_line is not None:
+                    failed = marker_line[len(marker):].strip() == "1"
+                self._stderr_feed.read_until(marker, stderr_buf, deadline)
+            except queue.Empty:
+                self._kill_current_command()
                 return f"Command timed out after {timeout_sec} seconds"
+        
+        stdout = stdout_buf.getvalue()
+        stderr = stderr_buf.getvalue()
+        
+        # If there's stderr content and it's an actual error, include it;
+        # _format_result_with_stderr does the trimming in that case
+        if stderr and failed:
+            return self._format_result_with_stderr(stdout, stderr)
             
-            # Remove trailing whitespace
-            stdout = stdout.rstrip('\n\r')
-            stderr = stderr.rstrip('\n\r')
+        return stdout.rstrip('\n\r')
+    
+    def _execute_in_fresh_process(self, command: str, timeout_sec: float) -> str:
+        """
+        Execute a command in a one-off PowerShell process, used when the session has crashed.
+        
+        Args:
+            command: The command to execute
+            timeout_sec: Timeout in seconds
             
-            # If there's stderr content and it's an actual error, include it
-            if stderr and process.returncode != 0:
-                return self._format_result_with_stderr(stdout, stderr)
+        Returns:
+            The command output or error message
+        """
+        try:
+            # Output goes to temporary files rather than pipes, so it never has to
+            # be held in memory whole; only a bounded head and tail are read back
+            with tempfile.TemporaryFile() as stdout_file, tempfile.TemporaryFile() as stderr_file:
+                process = subprocess.Popen(
+                    _POWERSHELL_CMD_BASE + [f"{_UTF8_PREAMBLE}; {command}"],
+                    stdout=stdout_file,
+                    stderr=stderr_file,
+                    cwd=os.getcwd(),  # Use current working directory
+                    **_POPEN_GROUP_KWARGS
+                )
                 
-            return stdout
+                # Wait for command completion with timeout
+                try:
+                    process.wait(timeout=timeout_sec)
+                except subprocess.TimeoutExpired:
+                    _terminate_process_tree(process)
+                    return f"Command timed out after {timeout_sec} seconds"
+                
+                return self._fresh_process_result(stdout_file, stderr_file, process.returncode)
             
         except Exception as e:
             return f"Error executing command: {str(e)}"
     
-    def _read_line_nonblocking_with_source(self) -> tuple[Optional[str], bool]:
+    def _fresh_process_result(self, stdout_file, stderr_file, returncode: int) -> str:
         """
-        Try to read a line from stdout or stderr without blocking.
-        Also returns whether the line came from stderr.
+        Build the result of a one-off PowerShell process from its output files.
         
+        Args:
+            stdout_file: Temporary file holding the process's standard output
+            stderr_file: Temporary file holding the process's standard error
+            returncode: The process's exit code
+            
         Returns:
-            A tuple of (line of output or None, is_stderr)
+            The command output, with stderr included if the process failed
         """
-        # This is a simplified approach for cross-platform compatibility
-        # In a production system, you might want to use select() or threading
-        try:
-            # Try to read from stdout first
-            line = self.shell_process.stdout.readline()
-            if line:
-                return line, False
-            
-            # Try to read from stderr
-            line = self.shell_process.stderr.readline()
-            if line:
-                return line, True
-        except Exception:
-            pass
+        stdout = self._read_output_file(stdout_file)
+        stderr = self._read_output_file(stderr_file)
+        
+        # If there's stderr content and it's an actual error, include it
+        if stderr and returncode != 0:
+            return self._format_result_with_stderr(stdout, stderr)
             
-        return None, False
+        return stdout.rstrip('\n\r')
     
-    def _read_line_blocking(self) -> str:
+    def _read_output_file(self, output_file) -> str:
         """
-        Read a line from stdout or stderr, blocking until data is available.
+        Read back command output captured in a temporary file, in bounded memory.
         
+        Args:
+            output_file: The binary file the process wrote to
+            
         Returns:
-            A line of output
+            The decoded output, truncated in the middle if it is too long
         """
-        line = self.shell_process.stdout.readline()
-        if not line:
-            line = self.shell_process.stderr.readline()
-        return line
+        output_file.seek(0)
+        # The command set UTF-8 output; newlines are normalized to '\n'
+        reader = io.TextIOWrapper(output_file, encoding='utf-8', errors='replace')
+        buf = _OutputBuffer()
+        try:
+            for chunk in iter(lambda: reader.read(65536), ''):
+                buf.write(chunk)
+        finally:
+            # Leave closing the file to its owner
+            reader.detach()
+        return buf.getvalue()
     
     def _kill_current_command(self):
         """
         Kill the currently running command in the PowerShell process.
+        
+        The session's whole process group is stopped and reaped, so commands it
+        started don't linger, and the shell is restarted because its state after
+        the interrupted command is unknown.
         """
         try:
-            if platform.system() == "Windows":
-                # Terminating the whole process is heavy-handed but reliable for timeout.
-                self.shell_process.terminate()
-            else:
-                self.shell_process.send_signal(signal.SIGINT)
-            
-            # Restart the shell to ensure a clean state
-            self._initialize_shell()
+            _terminate_process_tree(self.shell_process)
         except Exception:
-            self._initialize_shell()
+            pass
+        
+        # Restart the shell to ensure a clean state
+        self._initialize_shell()
     
     def _is_banned_command(self, command: str) -> bool:
         """
         Check if a command contains any banned commands.
+        
+        Args:
+            command: The command to check
+            
+        Returns:
+            True if the command contains a banned command, False otherwise
         """
+        if not command.isascii():
+            # Unicode word boundaries are left to the regex; whole words only
+            return _BANNED_RE.search(command) is not None
+        
+        # Most commands contain no banned name even as a substring, which
+        # plain `in` checks rule out fastest; only hits need the word check
         command_lower = command.lower()
-        for banned_cmd in BANNED_COMMANDS:
-            # Use regex to match whole words to avoid false positives
-            if re.search(r'\b' + re.escape(banned_cmd.lower()) + r'\b', command_lower):
-                return True
-        return False
+        if not any(banned in command_lower for banned in _BANNED_LOWER):
+            return False
+        
+        words = command_lower.translate(_BANNED_TOKEN_TRANS).split()
+        if not _BANNED_WORDS.isdisjoint(words):
+            return True
+        if _BANNED_HEADS.isdisjoint(words):
+            return False
+        return _BANNED_RE.search(command) is not None
 
     def _format_write_host_output(self, output: str) -> str:
         """
@@ -236,30 +601,6 @@ class PowerShellTool(Tool):
         # PowerShell Write-Host doesn't typically need special escaping
         return output
         
-    def _format_truncated_output(self, content: str) -> str:
-        """
-        Format large output with truncation in the middle.
-        
-        Args:
-            content: The content to truncate
-            
-        Returns:
-            Truncated content with a message in the middle
-        """
-        if len(content) <= MAX_OUTPUT_CHARS:
-            return content
-            
-        half_length = MAX_OUTPUT_CHARS // 2
-        start = content[:half_length]
-        end = content[-half_length:]
-        
-        # Count how many lines were truncated in the middle
-        middle_content = content[half_length:-half_length]
-        truncated_lines = middle_content.count('\n')
-        
-        truncated = f"{start}\n\n... [{truncated_lines} lines truncated] ...\n\n{end}"
-        return truncated
-        
     def _format_result_with_stderr(self, stdout: str, stderr: str) -> str:
         """
         Format the result with both stdout and stderr.
@@ -282,15 +623,6 @@ class PowerShellTool(Tool):
             return stderr_trimmed
         else:
             return stdout_trimmed
-    
-    def __del__(self):
-        """Clean up the PowerShell process when the tool is destroyed."""
-        if self.shell_process:
-            try:
-                self.shell_process.terminate()
-                self.shell_process.wait(timeout=1)
-            except Exception:
-                pass
 
 
 # Export the tool as an instance that can be directly used
@@ -5,8 +5,22 @@ Pytest configuration and fixtures for the SmolD tool tests.
 
 import os
 import shutil
+import sys
+from pathlib import Path
+
 import pytest
 
+# Make the project root importable once for every test module, without
+# adding a duplicate entry if it is already on the path
+_PROJECT_ROOT = str(Path(__file__).resolve().parents[3])
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+# Keep tiktoken's downloaded encodings next to the tests rather than in a
+# per-user temp directory, so CI can cache them between runs. This runs
+# before any test module imports smold.council; an explicit setting wins.
+os.environ.setdefault("TIKTOKEN_CACHE_DIR", str(Path(__file__).resolve().parent / ".tiktoken_cache"))
+
 
 @pytest.fixture(scope="session")
 def test_dir():
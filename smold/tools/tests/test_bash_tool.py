@@ -39,6 +39,20 @@ else:
             },
             "expected": "hello world"
         },
+        "stderr_output": {
+            "inputs": {
+                "command": "echo out; echo err >&2; echo out2",
+                "timeout": 5000
+            },
+            "expected": "out\nerr\nout2"
+        },
+        "output_without_trailing_newline": {
+            "inputs": {
+                "command": "printf 'no newline'",
+                "timeout": 5000
+            },
+            "expected": "no newline"
+        },
         "complex_command_pipeline": {
             "inputs": {
                 "command": f"find {TEST_DATA_DIR} -type f -name '*.json' | wc -l",
@@ -79,6 +93,50 @@ drwxr-xr-x  4 allanniemerg  staff   128 Jun  2 13:00 subfolder1
             result = bash_tool.forward(**test_data["inputs"])
             self.assertEqual(result.strip(), test_data["expected"])
 
+        def test_stderr_output(self):
+            """Test that stderr output is interleaved with stdout in order."""
+            test_data = EXPECTED_OUTPUTS["stderr_output"]
+            result = bash_tool.forward(**test_data["inputs"])
+            self.assertEqual(result.strip(), test_data["expected"])
+
+        def test_output_without_trailing_newline(self):
+            """Test output that does not end with a newline."""
+            test_data = EXPECTED_OUTPUTS["output_without_trailing_newline"]
+            result = bash_tool.forward(**test_data["inputs"])
+            self.assertEqual(result.strip(), test_data["expected"])
+
+        def test_banned_commands(self):
+            """Test that banned commands are rejected, including quoted or path forms."""
+            for command in ["curl http://example.com", "/usr/bin/wget x", 'c"ur"l x']:
+                result = bash_tool.forward(command, 5000)
+                self.assertTrue(result.startswith("Error: Command contains one or more banned commands"), command)
+            self.assertEqual(bash_tool.forward("echo curly", 5000).strip(), "curly")
+
+        def test_timeout_kills_command(self):
+            """Test that a timed-out command is killed and the shell stays usable."""
+            result = bash_tool.forward("sleep 30", 500)
+            self.assertIn("timed out", result)
+            self.assertEqual(bash_tool.forward("echo after", 5000).strip(), "after")
+
+        def test_follows_process_directory_changes(self):
+            """Test that the shell follows os.chdir calls made by the ChangeDirectory tool."""
+            original_cwd = os.getcwd()
+            try:
+                os.chdir(TEST_DATA_DIR)
+                result = bash_tool.forward("pwd", 5000)
+                self.assertEqual(os.path.realpath(result.strip()), os.path.realpath(TEST_DATA_DIR))
+            finally:
+                os.chdir(original_cwd)
+
+        def test_large_output_truncated(self):
+            """Test that huge output is truncated in the middle and fully drained."""
+            result = bash_tool.forward("seq 1 1000000", 30000)
+            self.assertIn("lines truncated", result)
+            self.assertTrue(result.startswith("1\n2\n3\n"))
+            self.assertLess(len(result), 31000)
+            # The rest of the output, including the marker, must not leak into the next command
+            self.assertEqual(bash_tool.forward("echo next", 5000).strip(), "next")
+
         def test_complex_command_pipeline(self):
             """Test a more complex command with piping."""
             test_data = EXPECTED_OUTPUTS["complex_command_pipeline"]
@@ -22,27 +22,38 @@ TEST_DATA_DIR = os.path.join(TEST_DIR, "testdata")
 class ChangeDirectoryToolTests(unittest.TestCase):
     """Tests for the ChangeDirectory tool."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Create one scratch root shared by all tests."""
+        cls._root = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the scratch root."""
+        import shutil
+        shutil.rmtree(cls._root, ignore_errors=True)
+
     def setUp(self):
         """Set up test environment."""
         self.original_cwd = os.getcwd()
-        self.temp_dir = tempfile.mkdtemp()
+        # Each test still gets its own directory, created under the shared root
+        self.temp_dir = tempfile.mkdtemp(dir=self._root)
         
         # Create test directory structure
         self.test_subdir = os.path.join(self.temp_dir, "test_subdir")
-        os.makedirs(self.test_subdir, exist_ok=True)
+        os.mkdir(self.test_subdir)
         
         # Create a file in temp dir to distinguish from directories
-        with open(os.path.join(self.temp_dir, "test_file.txt"), "w") as f:
-            f.write("test content")
+        fd = os.open(os.path.join(self.temp_dir, "test_file.txt"), os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, b"test content")
+        finally:
+            os.close(fd)
 
     def tearDown(self):
         """Clean up after tests."""
-        # Always return to original directory
+        # Always return to original directory; the temp directory goes with the scratch root
         os.chdir(self.original_cwd)
-        
-        # Clean up temp directory
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
 
     def test_change_to_valid_absolute_path(self):
         """Test changing to a valid absolute directory path."""
@@ -142,7 +153,7 @@ class ChangeDirectoryToolTests(unittest.TestCase):
         """Test that suggestions are provided for similar directory names."""
         # Create directory with similar name
         similar_dir = os.path.join(self.temp_dir, "test_similar")
-        os.makedirs(similar_dir, exist_ok=True)
+        os.mkdir(similar_dir)
         
         # Try to access with typo
         typo_path = os.path.join(self.temp_dir, "test_similar_typo")
@@ -158,6 +169,21 @@ class ChangeDirectoryToolTests(unittest.TestCase):
         # Should stay in original directory
         self.assertEqual(os.getcwd(), self.original_cwd)
 
+    def test_levenshtein_distance(self):
+        """Test the edit distance used for directory suggestions."""
+        cases = [
+            ("", "", 0),
+            ("src", "", 3),
+            ("src", "src", 0),
+            ("scr", "src", 2),
+            ("kitten", "sitting", 3),
+            ("node_modules", "node_moduels", 2),
+            ("a" * 70, "a" * 68 + "bb", 2),  # Longer than 64 chars uses the plain DP
+        ]
+        for s1, s2, expected in cases:
+            self.assertEqual(cd_tool._levenshtein_distance(s1, s2), expected, (s1, s2))
+            self.assertEqual(cd_tool._levenshtein_distance(s2, s1), expected, (s2, s1))
+
     def test_restricted_directory_protection(self):
         """Test that restricted system directories are protected."""
         if platform.system() == "Windows":
@@ -214,7 +240,7 @@ class ChangeDirectoryToolTests(unittest.TestCase):
         # We'll skip it if we can't create a permission-restricted directory
         try:
             restricted_dir = os.path.join(self.temp_dir, "restricted")
-            os.makedirs(restricted_dir, exist_ok=True)
+            os.mkdir(restricted_dir)
             
             # Try to remove permissions (Unix only)
             if platform.system() != "Windows":
@@ -252,7 +278,7 @@ class ChangeDirectoryToolTests(unittest.TestCase):
     def test_empty_directory_summary(self):
         """Test directory summary for empty directory."""
         empty_dir = os.path.join(self.temp_dir, "empty")
-        os.makedirs(empty_dir, exist_ok=True)
+        os.mkdir(empty_dir)
         
         result = cd_tool.forward(path=empty_dir)
         
@@ -7,11 +7,8 @@ for various message formats and model types.
 """
 
 import sys
-from pathlib import Path
 
-# Add the project root to path (go up 3 levels from tools/tests to project root)
-project_root = Path(__file__).parent.parent.parent.parent
-sys.path.insert(0, str(project_root))
+import pytest
 
 from smold.council import CouncilConsultation
 
@@ -19,9 +16,10 @@ from smold.council import CouncilConsultation
 class TestCouncilTiktoken:
     """Test class for council.py tiktoken functionality."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.council = CouncilConsultation()
+    @classmethod
+    def setup_class(cls):
+        """Set up test fixtures once; the tests only read from the council."""
+        cls.council = CouncilConsultation()
     
     def test_tokenizer_initialization(self):
         """Test that tokenizer is properly initialized."""
@@ -204,43 +202,5 @@ class TestCouncilTiktoken:
             raise AssertionError("Short content should not exceed token limit")
 
 
-def run_tests():
-    """Run all tests and report results."""
-    test_instance = TestCouncilTiktoken()
-    test_instance.setup_method()
-    
-    tests = [
-        test_instance.test_tokenizer_initialization,
-        test_instance.test_count_tokens_simple_text,
-        test_instance.test_count_tokens_empty_text,
-        test_instance.test_count_tokens_long_text,
-        test_instance.test_num_tokens_from_messages_simple,
-        test_instance.test_num_tokens_from_messages_with_name,
-        test_instance.test_num_tokens_from_messages_multiple,
-        test_instance.test_num_tokens_from_messages_content_array,
-        test_instance.test_num_tokens_from_messages_different_models,
-        test_instance.test_prepare_consultation_content_token_counting,
-        test_instance.test_token_count_consistency,
-        test_instance.test_token_limits,
-    ]
-    
-    passed = 0
-    failed = 0
-    
-    for test in tests:
-        try:
-            print(f"Running {test.__name__}...", end=" ")
-            test()
-            print("✅ PASSED")
-            passed += 1
-        except Exception as e:
-            print(f"❌ FAILED: {e}")
-            failed += 1
-    
-    print(f"\n📊 Test Results: {passed} passed, {failed} failed")
-    return failed == 0
-
-
 if __name__ == "__main__":
-    success = run_tests()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    sys.exit(pytest.main([__file__]))
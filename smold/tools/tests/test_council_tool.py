@@ -5,12 +5,7 @@ Note: These tests mock the council functionality to avoid requiring API keys dur
 """
 
 import unittest
-import sys
-from unittest.mock import Mock, patch
-from pathlib import Path
-
-# Add the parent directory to the path to import council_tool
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from unittest.mock import AsyncMock, Mock, patch
 
 try:
     from smold.tools.council_tool import council_tool, consult_council, CouncilConsultationTool
@@ -20,6 +15,28 @@ except ImportError:
     CouncilConsultationTool = None
 
 
+def _make_mock_council(content="test content",
+                       responses=("OpenAI response", "Gemini response", "DeepSeek response"),
+                       formatted="Formatted council response"):
+    """
+    Build a mock CouncilConsultation wired for one consultation.
+    
+    Args:
+        content: What prepare_consultation_content returns
+        responses: The (OpenAI, Gemini, DeepSeek) responses run_async_consultation returns
+        formatted: What format_council_response returns
+    
+    Returns:
+        The configured mock council instance
+    """
+    return Mock(**{
+        "prepare_consultation_content.return_value": content,
+        "run_async_consultation": AsyncMock(return_value=responses),
+        "format_council_response.return_value": formatted,
+        "save_consultation_log.return_value": None,
+    })
+
+
 class TestCouncilTool(unittest.TestCase):
     """Test cases for the Council Tool."""
     
@@ -44,22 +61,11 @@ class TestCouncilTool(unittest.TestCase):
         """Test that the council tool has correct output type."""
         self.assertEqual(council_tool.output_type, "string")
     
-    @patch('smold.tools.council_tool.CouncilConsultation')
-    def test_consult_council_success(self, mock_council_class):
+    @patch('smold.tools.council_tool._get_council_cls')
+    def test_consult_council_success(self, mock_get_council_cls):
         """Test successful council consultation with mocked responses."""
-        # Setup mock council instance
-        mock_council = Mock()
-        mock_council_class.return_value = mock_council
-        
-        # Mock the consultation process
-        mock_council.prepare_consultation_content.return_value = "test content"
-        mock_council.run_parallel_consultation.return_value = (
-            "OpenAI response", 
-            "Gemini response", 
-            "DeepSeek response"
-        )
-        mock_council.format_council_response.return_value = "Formatted council response"
-        mock_council.save_consultation_log.return_value = None
+        mock_council_class = mock_get_council_cls.return_value
+        mock_council = mock_council_class.return_value = _make_mock_council()
         
         # Test the function
         result = consult_council("Test prompt", "Test context")
@@ -75,7 +81,7 @@ class TestCouncilTool(unittest.TestCase):
             context="Test context", 
             context_file=""
         )
-        mock_council.run_parallel_consultation.assert_called_once_with("test content")
+        mock_council.run_async_consultation.assert_awaited_once_with("test content")
         mock_council.format_council_response.assert_called_once_with(
             "OpenAI response", 
             "Gemini response", 
@@ -84,14 +90,15 @@ class TestCouncilTool(unittest.TestCase):
     
     def test_consult_council_missing_dependencies(self):
         """Test council consultation when dependencies are missing."""
-        # This test simulates the case where CouncilConsultation is None
-        with patch('smold.tools.council_tool.CouncilConsultation', None):
+        # This test simulates the case where CouncilConsultation cannot be imported
+        with patch('smold.tools.council_tool._get_council_cls', return_value=None):
             result = consult_council("Test prompt")
             self.assertIn("Council consultation is not available", result)
     
-    @patch('smold.tools.council_tool.CouncilConsultation')
-    def test_consult_council_error_handling(self, mock_council_class):
+    @patch('smold.tools.council_tool._get_council_cls')
+    def test_consult_council_error_handling(self, mock_get_council_cls):
         """Test error handling in council consultation."""
+        mock_council_class = mock_get_council_cls.return_value
         # Setup mock to raise an exception
         mock_council_class.side_effect = Exception("Test error")
         
@@ -100,16 +107,12 @@ class TestCouncilTool(unittest.TestCase):
         self.assertIn("Error during council consultation", result)
         self.assertIn("Test error", result)
     
-    @patch('smold.tools.council_tool.CouncilConsultation')
-    def test_consult_council_with_context_file(self, mock_council_class):
+    @patch('smold.tools.council_tool._get_council_cls')
+    def test_consult_council_with_context_file(self, mock_get_council_cls):
         """Test council consultation with context file."""
-        # Setup mock council instance
-        mock_council = Mock()
-        mock_council_class.return_value = mock_council
-        
-        mock_council.prepare_consultation_content.return_value = "content with file"
-        mock_council.run_parallel_consultation.return_value = ("", "", "")
-        mock_council.format_council_response.return_value = "Response with file context"
+        mock_council = mock_get_council_cls.return_value.return_value = _make_mock_council(
+            "content with file", ("", "", ""), "Response with file context"
+        )
         
         result = consult_council("Test prompt", "Test context", "/path/to/file.md")
         
@@ -122,6 +125,36 @@ class TestCouncilTool(unittest.TestCase):
         
         self.assertEqual(result, "Response with file context")
     
+    @patch.dict('os.environ', {"SMOLD_COUNCIL_CACHE": "1"})
+    @patch('smold.tools.council_tool._get_council_cls')
+    def test_consult_council_cache(self, mock_get_council_cls):
+        """Test that repeated consultations are answered from the cache when enabled."""
+        mock_council = mock_get_council_cls.return_value.return_value = _make_mock_council(
+            "cached content", ("a", "b", "c"), "Cached council response"
+        )
+        
+        with patch.dict('smold.tools.council_tool._COUNCIL_CACHE', clear=True):
+            first = consult_council("Test prompt")
+            second = consult_council("Test prompt")
+        
+        self.assertEqual(first, "Cached council response")
+        self.assertEqual(second, "Cached council response")
+        mock_council.run_async_consultation.assert_awaited_once_with("cached content")
+        mock_council.initialize_clients.assert_called_once_with()
+    
+    @patch('smold.tools.council_tool.consult_council', return_value="Council response")
+    @patch('smold.tools.council_tool.user_input_tool')
+    def test_forward_always_skips_later_confirmation(self, mock_user_input, mock_consult):
+        """Test that answering 'always' stops the confirmation prompt for the session."""
+        mock_user_input.forward.return_value = "always"
+        
+        with patch('smold.tools.council_tool._CONFIRMED', False):
+            self.assertEqual(council_tool.forward("First prompt"), "Council response")
+            self.assertEqual(council_tool.forward("Second prompt"), "Council response")
+        
+        mock_user_input.forward.assert_called_once()
+        self.assertEqual(mock_consult.call_count, 2)
+    
     def test_council_tool_is_instance(self):
         """Test that the council tool is properly instantiated."""
         self.assertIsInstance(council_tool, CouncilConsultationTool)
@@ -10,17 +10,16 @@ import os
 import unittest
 import tempfile
 import shutil
+from unittest import mock
 from typing import Dict, Any
 
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from smold.tools import edit_tool
 from smold.tools.edit_tool import file_edit_tool
 
 # Constants
 TEST_DIR = os.path.dirname(os.path.abspath(__file__))
 TEST_DATA_DIR = os.path.join(TEST_DIR, "testdata")
-TEMP_DIR = os.path.join(TEST_DIR, "temp")
+TEMP_DIR = os.path.join(TEST_DIR, "temp_edit")  # Not shared, so parallel workers can't remove it mid-test
 
 # Expected output patterns (partial matches to account for path differences)
 EXPECTED_PATTERNS = {
@@ -116,6 +115,101 @@ class EditToolTests(unittest.TestCase):
             content = f.read()
             self.assertEqual(content, test_data["inputs"]["new_string"])
 
+    def test_modify_preserves_mode_and_leaves_no_temp_files(self):
+        """Test that the atomic write keeps permissions and cleans up after itself."""
+        test_data = EXPECTED_PATTERNS["modify_file_with_context"]
+        file_path = test_data["inputs"]["file_path"]
+        os.chmod(file_path, 0o640)
+        
+        file_edit_tool.forward(**test_data["inputs"])
+        
+        self.assertEqual(os.stat(file_path).st_mode & 0o777, 0o640)
+        leftovers = [name for name in os.listdir(TEMP_DIR) if name.endswith(".tmp")]
+        self.assertEqual(leftovers, [])
+
+
+    def test_modify_with_whitespace_mismatch(self):
+        """Test that a whitespace-insensitive match edits the matching span."""
+        file_path = os.path.join(TEMP_DIR, "whitespace.py")
+        with open(file_path, 'w') as f:
+            f.write("def f():\n    x  =  1\n\tif x:\n        return x\n")
+        
+        result = file_edit_tool.forward(file_path, "x = 1\nif x:", "x = 2\n    if x:")
+        
+        self.assertIn("has been updated", result)
+        with open(file_path, 'r') as f:
+            self.assertEqual(f.read(), "def f():\n    x = 2\n    if x:\n        return x\n")
+
+
+    def test_modify_large_file_via_mmap(self):
+        """Test the memory-mapped path used for large files."""
+        file_path = os.path.join(TEMP_DIR, "large.txt")
+        with open(file_path, 'w') as f:
+            f.write("".join(f"line {i}\n" for i in range(100)))
+        
+        with mock.patch.object(edit_tool, "MMAP_THRESHOLD", 1):
+            result = file_edit_tool.forward(file_path, "line 50\n", "changed\n")
+        
+        self.assertIn("has been updated", result)
+        self.assertIn("changed", result)
+        with open(file_path, 'r') as f:
+            content = f.read()
+        self.assertEqual(content, "".join("changed\n" if i == 50 else f"line {i}\n" for i in range(100)))
+
+    def test_large_and_small_paths_agree_on_latin1_files(self):
+        """Test that a large latin-1 file is transcoded to UTF-8 like a small one."""
+        results = []
+        for threshold in (1, edit_tool.MMAP_THRESHOLD):
+            file_path = os.path.join(TEMP_DIR, f"latin1_{threshold}.txt")
+            with open(file_path, 'wb') as f:
+                f.write("caf\u00e9\nline 2\n".encode('latin-1'))
+            with mock.patch.object(edit_tool, "MMAP_THRESHOLD", threshold):
+                file_edit_tool.forward(file_path, "line 2", "changed")
+            with open(file_path, 'rb') as f:
+                results.append(f.read())
+        
+        self.assertEqual(results, ["caf\u00e9\nchanged\n".encode('utf-8')] * 2)
+
+    def test_noop_edit_skips_write(self):
+        """Test that an edit producing identical content does not rewrite the file."""
+        file_path = os.path.join(TEMP_DIR, "noop.txt")
+        with open(file_path, 'w') as f:
+            f.write("alpha\nbeta\n")
+        os.utime(file_path, (1000000000, 1000000000))
+        
+        result = file_edit_tool.forward(file_path, "beta", "beta")
+        
+        self.assertIn("(no change written)", result)
+        self.assertEqual(os.stat(file_path).st_mtime, 1000000000)
+
+
+    def test_modify_keeps_hard_links(self):
+        """Test that a file with another hard link is edited in place rather than replaced."""
+        file_path = os.path.join(TEMP_DIR, "linked.txt")
+        link_path = os.path.join(TEMP_DIR, "linked_alias.txt")
+        with open(file_path, 'w') as f:
+            f.write("alpha\nbeta\n")
+        os.link(file_path, link_path)
+        
+        result = file_edit_tool.forward(file_path, "beta", "gamma")
+        
+        self.assertIn("has been updated", result)
+        with open(link_path, 'r') as f:
+            self.assertEqual(f.read(), "alpha\ngamma\n")
+
+    def test_modify_without_temp_file(self):
+        """Test that the file is written in place when no temporary file can be created."""
+        file_path = os.path.join(TEMP_DIR, "no_temp.txt")
+        with open(file_path, 'w') as f:
+            f.write("alpha\nbeta\n")
+        
+        with mock.patch.object(edit_tool.tempfile, "mkstemp", side_effect=PermissionError("read-only directory")):
+            result = file_edit_tool.forward(file_path, "beta", "gamma")
+        
+        self.assertIn("has been updated", result)
+        with open(file_path, 'r') as f:
+            self.assertEqual(f.read(), "alpha\ngamma\n")
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
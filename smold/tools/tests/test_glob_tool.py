@@ -7,7 +7,9 @@ for standard inputs, effectively "locking in" the current behavior.
 """
 
 import os
+import tempfile
 import unittest
+import warnings
 import re
 from typing import Dict, Any, List
 
@@ -55,6 +57,16 @@ EXPECTED_PATTERNS = {
             "test_config.json",
             "subfolder1/subfolder2/test_config.yml"
         ]
+    },
+    "find_in_subdirectory": {
+        "inputs": {
+            "pattern": "subfolder1/*.*",
+            "path": TEST_DATA_DIR
+        },
+        "expected_files": [
+            "subfolder1/test_file3.txt",
+            "subfolder1/test_component.jsx"
+        ]
     }
 }
 
@@ -84,45 +96,101 @@ class GlobToolTests(unittest.TestCase):
             f"Expected {len(expected_files)} files, but found {len(found_files)}"
         )
         
+        # Normalize the found paths once; basenames go in a set for direct lookup
+        found_basenames = {os.path.basename(file_path) for file_path in found_files}
+        found_normalized = [(os.path.normpath(file_path), file_path.replace('\\', '/'))
+                            for file_path in found_files]
+        
         # Check that each expected file is in the results
         for expected_file in expected_files:
-            found = False
             # Normalize expected file path for cross-platform compatibility
             expected_normalized = expected_file.replace('/', os.sep)
             
-            for file_path in found_files:
-                # Normalize the file path and check multiple ways
-                file_normalized = os.path.normpath(file_path)
-                
-                if (os.path.basename(file_path) == os.path.basename(expected_file) or
-                    expected_normalized in file_normalized or
-                    expected_file in file_path.replace('\\', '/') or
-                    file_path.endswith(expected_normalized)):
-                    found = True
-                    break
+            # A matching basename is enough; otherwise look for the path inside a result
+            # (which also covers a result ending with it)
+            found = (os.path.basename(expected_file) in found_basenames or
+                     any(expected_normalized in file_normalized or expected_file in file_slashed
+                         for file_normalized, file_slashed in found_normalized))
                     
             self.assertTrue(
                 found, 
                 f"File '{expected_file}' was not found in glob results. Found files: {found_files}"
             )
 
-    def test_find_text_files(self):
-        """Test finding text files with a simple pattern."""
-        test_data = EXPECTED_PATTERNS["find_text_files"]
+    def _run_case(self, name: str) -> None:
+        """
+        Run the glob tool on one entry of EXPECTED_PATTERNS and verify the result.
+        
+        Args:
+            name: The key of the test case in EXPECTED_PATTERNS
+        """
+        test_data = EXPECTED_PATTERNS[name]
         result = glob_tool.forward(**test_data["inputs"])
         self._verify_glob_results(result, test_data["expected_files"])
 
+    def test_find_text_files(self):
+        """Test finding text files with a simple pattern."""
+        self._run_case("find_text_files")
+
     def test_find_all_recursively(self):
         """Test finding all files recursively."""
-        test_data = EXPECTED_PATTERNS["find_all_recursively"]
-        result = glob_tool.forward(**test_data["inputs"])
-        self._verify_glob_results(result, test_data["expected_files"])
+        self._run_case("find_all_recursively")
 
     def test_find_config_files(self):
         """Test finding config files with a complex pattern."""
-        test_data = EXPECTED_PATTERNS["find_config_files"]
-        result = glob_tool.forward(**test_data["inputs"])
-        self._verify_glob_results(result, test_data["expected_files"])
+        self._run_case("find_config_files")
+
+    def test_find_in_subdirectory(self):
+        """Test that single-star segments do not descend into deeper directories."""
+        self._run_case("find_in_subdirectory")
+
+    @unittest.skipIf(os.name == "nt", "creating symlinks may need extra privileges on Windows")
+    def test_symlinks_and_dotfiles(self):
+        """Test that symlinked directories are followed and non-'**' wildcards match dotfiles."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.makedirs(os.path.join(tmp_dir, "real", ".hidden"))
+            for name in ("real/a.py", "real/.hidden/b.py", ".dot.py"):
+                open(os.path.join(tmp_dir, name), "w").close()
+            os.symlink(os.path.join(tmp_dir, "real"), os.path.join(tmp_dir, "link"))
+            # A loop back to the top must not be walked forever
+            os.symlink(tmp_dir, os.path.join(tmp_dir, "real", "up"))
+            
+            def found(pattern):
+                result = glob_tool.forward(pattern=pattern, path=tmp_dir)
+                return {os.path.relpath(line, tmp_dir) for line in result.splitlines()}
+            
+            self.assertEqual(found("**/*.py"), {
+                os.path.join("real", "a.py"),
+                os.path.join("link", "a.py"),
+            })
+            self.assertEqual(found("*"), {".dot.py"})
+            self.assertEqual(found("*/.*/*.py"), {
+                os.path.join("real", ".hidden", "b.py"),
+                os.path.join("link", ".hidden", "b.py"),
+            })
+
+    
+    def test_character_sets(self):
+        """Test that '[...]' sets follow fnmatch and never raise or match '/'."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.makedirs(os.path.join(tmp_dir, "a"))
+            for name in ("b.py", "[b].py", "-.py", os.path.join("a", "b")):
+                open(os.path.join(tmp_dir, name), "w").close()
+            
+            def found(pattern):
+                with warnings.catch_warnings():
+                    warnings.simplefilter("error")
+                    result = glob_tool.forward(pattern=pattern, path=tmp_dir)
+                if result == "No files found":
+                    return set()
+                return {os.path.relpath(line, tmp_dir) for line in result.splitlines()}
+            
+            self.assertEqual(found("[z-a].py"), set())
+            self.assertEqual(found("[[]b].py"), {"[b].py"})
+            self.assertEqual(found("[a-c--d].py"), {"b.py", "-.py"})
+            self.assertEqual(found("[a&&b].py"), {"b.py"})
+            self.assertEqual(found("[!]].py"), {"b.py", "-.py"})
+            self.assertEqual(found("a[%-0]b"), set())
 
 
 if __name__ == "__main__":
@@ -7,6 +7,7 @@ for standard inputs, effectively "locking in" the current behavior.
 """
 
 import os
+import tempfile
 import unittest
 import re
 from typing import Dict, Any, List
@@ -14,6 +15,7 @@ from typing import Dict, Any, List
 from smold.tools.grep_tool import grep_tool
 
 # Constants
+COUNT_RE = re.compile(r"Found (\d+) files?")
 TEST_DIR = os.path.dirname(os.path.abspath(__file__))
 TEST_DATA_DIR = os.path.join(TEST_DIR, "testdata")
 
@@ -87,7 +89,7 @@ class GrepToolTests(unittest.TestCase):
         result_text = result
         
         # Extract the count from "Found X files" pattern
-        count_match = re.search(r"Found (\d+) files?", result_text)
+        count_match = COUNT_RE.search(result_text)
         self.assertIsNotNone(count_match, "Count pattern not found in result")
         found_count = int(count_match.group(1))
         
@@ -101,70 +103,84 @@ class GrepToolTests(unittest.TestCase):
         # Extract the list of files
         lines = result_text.strip().split('\n')[1:]  # Skip the "Found X files" line
         
+        found_basenames = {os.path.basename(file_path) for file_path in lines}
+        
         # Check that each expected file is in the results
         for expected_file in expected_files:
-            found = False
-            for file_path in lines:
-                if os.path.basename(file_path) == expected_file or expected_file in file_path:
-                    found = True
-                    break
+            found = (expected_file in found_basenames or
+                     any(expected_file in file_path for file_path in lines))
                     
             self.assertTrue(
                 found, 
                 f"File '{expected_file}' was not found in grep results"
             )
 
+    def _run_case(self, name: str) -> None:
+        """
+        Run the grep tool on one entry of TEST_CASES and verify the result.
+        
+        Args:
+            name: The key of the test case in TEST_CASES
+        """
+        test_data = TEST_CASES[name]
+        result = grep_tool.forward(**test_data["inputs"])
+        self._verify_grep_results(result, test_data["expected_count"], test_data["expected_files"])
+
     def test_search_for_function(self):
         """Test searching for 'function' keyword."""
-        test_data = TEST_CASES["search_for_function"]
-        result = grep_tool.forward(**test_data["inputs"])
-        
-        result_text = result
-            
-        self._verify_grep_results(
-            result_text, 
-            test_data["expected_count"],
-            test_data["expected_files"]
-        )
+        self._run_case("search_for_function")
 
     def test_search_for_class(self):
         """Test searching for class definitions."""
-        test_data = TEST_CASES["search_for_class"]
-        result = grep_tool.forward(**test_data["inputs"])
-        
-        result_text = result
-            
-        self._verify_grep_results(
-            result_text,
-            test_data["expected_count"],
-            test_data["expected_files"]
-        )
+        self._run_case("search_for_class")
 
     def test_search_for_exports(self):
         """Test searching for export statements."""
-        test_data = TEST_CASES["search_for_exports"]
-        result = grep_tool.forward(**test_data["inputs"])
-        
-        result_text = result
-            
-        self._verify_grep_results(
-            result_text,
-            test_data["expected_count"],
-            test_data["expected_files"]
-        )
+        self._run_case("search_for_exports")
 
     def test_search_for_react_hooks(self):
         """Test searching for React hooks."""
-        test_data = TEST_CASES["search_for_react_hooks"]
-        result = grep_tool.forward(**test_data["inputs"])
-        
-        result_text = result
+        self._run_case("search_for_react_hooks")
+
+    def test_rewritten_binary_file_is_searched(self):
+        """Test that a file classified as binary is searched again once it changes."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "data.txt")
+            with open(file_path, "wb") as f:
+                f.write(b"needle\x00\xff\xfe\x00")
+            self.assertEqual(grep_tool.forward(pattern="needle", path=tmp_dir), "No files found")
             
-        self._verify_grep_results(
-            result_text,
-            test_data["expected_count"],
-            test_data["expected_files"]
-        )
+            with open(file_path, "w") as f:
+                f.write("needle in text\n")
+            self.assertIn(file_path, grep_tool.forward(pattern="needle", path=tmp_dir))
+
+    def test_matches_stay_within_one_line(self):
+        """Test that patterns match one line at a time, and '.' matches a whole character."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "notes.txt")
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write("hello world\nfoo\nbar caf\u00e9s\n")
+            
+            for pattern in ("caf.s", "caf[^x]s", "^bar", "foo$"):
+                with self.subTest(pattern=pattern):
+                    self.assertIn(file_path, grep_tool.forward(pattern=pattern, path=tmp_dir))
+            for pattern in ("foo\\s+bar", "world[^z]*bar", "^$"):
+                with self.subTest(pattern=pattern):
+                    self.assertEqual(grep_tool.forward(pattern=pattern, path=tmp_dir), "No files found")
+
+    @unittest.skipIf(os.name == "nt", "creating symlinks may need extra privileges on Windows")
+    def test_recursive_include_follows_symlinked_directories(self):
+        """Test that '**' includes search inside symlinked directories, without looping."""
+        with tempfile.TemporaryDirectory() as tmp_dir, tempfile.TemporaryDirectory() as other_dir:
+            with open(os.path.join(other_dir, "linked.py"), "w") as f:
+                f.write("needle\n")
+            os.symlink(other_dir, os.path.join(tmp_dir, "link"))
+            os.symlink(tmp_dir, os.path.join(other_dir, "back"))
+            
+            linked_path = os.path.join(tmp_dir, "link", "linked.py")
+            self.assertIn(linked_path, grep_tool.forward(pattern="needle", path=tmp_dir, include="**/*.py"))
+            # Like os.walk, plain name includes stay out of symlinked directories
+            self.assertEqual(grep_tool.forward(pattern="needle", path=tmp_dir, include="*.py"), "No files found")
 
 
 if __name__ == "__main__":
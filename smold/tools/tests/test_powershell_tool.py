@@ -6,17 +6,23 @@ These tests verify that the PowerShell tool continues to produce the expected ou
 for standard inputs, effectively "locking in" the current behavior.
 """
 
+import asyncio
 import os
+import shutil
 import unittest
 import platform
 from typing import Dict, Any
 
-from smold.tools.powershell_tool import powershell_tool
+from smold.tools.powershell_tool import PowerShellTool, powershell_tool, _POWERSHELL_CMD_BASE
 
 # Constants
 TEST_DIR = os.path.dirname(os.path.abspath(__file__))
 TEST_DATA_DIR = os.path.join(TEST_DIR, "testdata")
 
+# The test data directory is listed once here, and the PowerShell output is compared against it
+TEST_DATA_ENTRIES = sorted(os.listdir(TEST_DATA_DIR))
+TEST_DATA_FILE_COUNT = sum(os.path.isfile(os.path.join(TEST_DATA_DIR, name)) for name in TEST_DATA_ENTRIES)
+
 # Expected outputs for PowerShell commands
 EXPECTED_OUTPUTS = {
     "simple_command": {
@@ -52,84 +58,42 @@ EXPECTED_OUTPUTS = {
             "command": f"(Get-ChildItem -Path '{TEST_DATA_DIR}' -File).Count",
             "timeout": 10000
         },
-        "expected": "6"
+        "expected": str(TEST_DATA_FILE_COUNT)
     },
     "directory_listing": {
         "inputs": {
             "command": f"Get-ChildItem -Path '{TEST_DATA_DIR}' -Name | Sort-Object",
             "timeout": 5000
         },
-        "expected_files": [
-            "large_file.txt",
-            "subfolder1", 
-            "test_config.json",
-            "test_file1.txt",
-            "test_file2.py",
-            "test_js_file.js",
-            "test_typescript_file.ts"
-        ]
+        "expected_files": TEST_DATA_ENTRIES
     }
 }
 
 
+# Look for the executable the tool runs once, rather than starting PowerShell to find out
+@unittest.skipUnless(shutil.which(_POWERSHELL_CMD_BASE[0]), "PowerShell not available on this system")
 class PowerShellToolTests(unittest.TestCase):
     """Tests for the PowerShell tool."""
 
-    @classmethod
-    def setUpClass(cls):
-        """Set up test class - check if PowerShell is available."""
-        try:
-            # Test if PowerShell is available by running a simple command
-            result = powershell_tool.forward("Write-Host 'test'", timeout=2000)
-            if "Error" in result and "PowerShell not found" in result:
-                raise unittest.SkipTest("PowerShell not available on this system")
-        except Exception as e:
-            raise unittest.SkipTest(f"PowerShell not available: {str(e)}")
-
-    def test_simple_command(self):
-        """Test a simple Write-Host command."""
-        test_data = EXPECTED_OUTPUTS["simple_command"]
-        result = powershell_tool.forward(**test_data["inputs"])
-        self.assertEqual(result.strip(), test_data["expected"])
-
-    def test_environment_variables(self):
-        """Test environment variable setting and retrieval."""
-        test_data = EXPECTED_OUTPUTS["environment_variables"]
-        result = powershell_tool.forward(**test_data["inputs"])
-        self.assertEqual(result.strip(), test_data["expected"])
-
-    def test_arithmetic_operation(self):
-        """Test arithmetic operations in PowerShell."""
-        test_data = EXPECTED_OUTPUTS["arithmetic_operation"]
-        result = powershell_tool.forward(**test_data["inputs"])
-        self.assertEqual(result.strip(), test_data["expected"])
-
-    def test_multiline_output(self):
-        """Test commands that produce multiple lines of output."""
-        test_data = EXPECTED_OUTPUTS["multiline_output"]
-        result = powershell_tool.forward(**test_data["inputs"])
-        # Normalize line endings for cross-platform compatibility
-        normalized_result = result.strip().replace('\r\n', '\n')
-        self.assertEqual(normalized_result, test_data["expected"])
-
-    def test_file_count(self):
-        """Test counting files in the test data directory."""
-        test_data = EXPECTED_OUTPUTS["file_count"]
-        result = powershell_tool.forward(**test_data["inputs"])
-        self.assertEqual(result.strip(), test_data["expected"])
+    def test_expected_outputs(self):
+        """Test every EXPECTED_OUTPUTS case that has an exact expected string."""
+        for name, test_data in EXPECTED_OUTPUTS.items():
+            if "expected" not in test_data:
+                continue
+            with self.subTest(case=name):
+                result = powershell_tool.forward(**test_data["inputs"])
+                # Normalize line endings for cross-platform compatibility
+                self.assertEqual(result.strip().replace('\r\n', '\n'), test_data["expected"])
 
     def test_directory_listing(self):
         """Test directory listing with sorted output."""
         test_data = EXPECTED_OUTPUTS["directory_listing"]
         result = powershell_tool.forward(**test_data["inputs"])
         
-        # Split result into lines and check for expected files/directories
-        result_lines = [line.strip() for line in result.strip().split('\n') if line.strip()]
-        
-        # Check that all expected files are present
-        for expected_file in test_data["expected_files"]:
-            self.assertIn(expected_file, result_lines, 
-                         f"Expected file/directory '{expected_file}' not found in listing")
+        # Split result into a set of names and check for expected files/directories
+        result_names = {name for name in map(str.strip, result.splitlines()) if name}
+        missing = set(test_data["expected_files"]) - result_names
+        self.assertFalse(missing, f"Expected files/directories not found in listing: {sorted(missing)}")
 
     def test_error_handling(self):
         """Test error handling for invalid commands."""
@@ -138,20 +102,6 @@ class PowerShellToolTests(unittest.TestCase):
         self.assertTrue(any(word in result.lower() for word in ['error', 'not', 'recognized', 'cmdlet']),
                        f"Expected error message, got: {result}")
 
-    def test_banned_command_protection(self):
-        """Test that banned commands are properly blocked."""
-        banned_commands = [
-            "Invoke-WebRequest https://example.com",
-            "wget https://example.com", 
-            "curl https://example.com",
-            "Start-Process notepad"
-        ]
-        
-        for cmd in banned_commands:
-            result = powershell_tool.forward(cmd, timeout=1000)
-            self.assertIn("banned", result.lower(), 
-                         f"Banned command '{cmd}' was not properly blocked: {result}")
-
     def test_timeout_functionality(self):
         """Test that timeout works properly."""
         # Use a command that will take longer than the timeout
@@ -170,6 +120,24 @@ class PowerShellToolTests(unittest.TestCase):
         result = powershell_tool.forward("$TestVariable = 'persistent_value'; Write-Host $TestVariable", timeout=5000)
         self.assertEqual(result.strip(), "persistent_value")
 
+    def test_multiline_command(self):
+        """Test that a command spanning several lines runs whole, and its variables persist."""
+        command = (
+            "if ($false) {\n"
+            "    Write-Host 'wrong branch'\n"
+            "}\n"
+            "else {\n"
+            "    $MultilineVariable = 'set in block'\n"
+            "    Write-Host 'in block'\n"
+            "}\n"
+            "Write-Host 'after'"
+        )
+        result = powershell_tool.forward(command, timeout=5000)
+        self.assertEqual(result.strip().replace('\r\n', '\n'), "in block\nafter")
+        
+        result = powershell_tool.forward("Write-Host $MultilineVariable", timeout=5000)
+        self.assertEqual(result.strip(), "set in block")
+
     def test_working_directory_persistence(self):
         """Test that working directory can be changed and verified within a single command."""
         # Change directory and verify location in a single command
@@ -178,5 +146,42 @@ class PowerShellToolTests(unittest.TestCase):
                        f"Expected to be in testdata directory, but got: {result.strip()}")
 
 
+    def test_aforward_runs_commands_concurrently(self):
+        """Test that aforward calls run side by side, each in its own process."""
+        async def run_both():
+            return await asyncio.gather(
+                powershell_tool.aforward("Write-Host 'first'", timeout=10000),
+                powershell_tool.aforward("Write-Host 'second'", timeout=10000),
+            )
+        
+        self.assertEqual([r.strip() for r in asyncio.run(run_both())], ["first", "second"])
+        
+        result = asyncio.run(powershell_tool.aforward("Start-Sleep 3", timeout=1000))
+        self.assertIn("timed out", result.lower())
+
+
+class BannedCommandTests(unittest.TestCase):
+    """Tests for banned-command filtering, which is checked before PowerShell is started."""
+
+    BANNED_COMMANDS = [
+        "Invoke-WebRequest https://example.com",
+        "wget https://example.com",
+        "curl https://example.com",
+        "Start-Process notepad",
+    ]
+
+    def test_banned_command_protection(self):
+        """Test that banned commands are properly blocked."""
+        tool = PowerShellTool()
+        for cmd in self.BANNED_COMMANDS:
+            with self.subTest(command=cmd):
+                result = tool.forward(cmd, timeout=1000)
+                self.assertIn("banned", result.lower(),
+                              f"Banned command '{cmd}' was not properly blocked: {result}")
+        
+        # Blocking a command must not have started a session
+        self.assertIsNone(tool.shell_process)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
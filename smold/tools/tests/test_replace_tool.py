@@ -16,7 +16,7 @@ from smold.tools.replace_tool import write_tool
 
 # Constants
 TEST_DIR = os.path.dirname(os.path.abspath(__file__))
-TEMP_DIR = os.path.join(TEST_DIR, "temp")
+TEMP_DIR = os.path.join(TEST_DIR, "temp_replace")  # Not shared, so parallel workers can't remove it mid-test
 
 # Test cases with expected patterns to check in the output
 TEST_CASES = {
@@ -8,13 +8,16 @@ for standard inputs, effectively "locking in" the current behavior.
 
 import os
 import json
+import tempfile
 import unittest
 import re
 from typing import Dict, Any, List
 
-from smold.tools.view_tool import view_tool
+from smold.tools.view_tool import ViewTool, view_tool
 
 # Constants
+LINE_NUMBER_RE = re.compile(r"(\d+)\t")
+LINE_PREFIX_RE = re.compile(r"^\s+\d+\t")
 TEST_DIR = os.path.dirname(os.path.abspath(__file__))
 TEST_DATA_DIR = os.path.join(TEST_DIR, "testdata")
 
@@ -84,7 +87,7 @@ class ViewToolTests(unittest.TestCase):
             self.assertIn(pattern, result)
             
         # The output should have line numbers
-        self.assertRegex(result, r"^\s+\d+\t")
+        self.assertRegex(result, LINE_PREFIX_RE)
 
     def test_view_large_file_with_limits(self):
         """Test viewing a large file with offset and limit parameters."""
@@ -105,9 +108,9 @@ class ViewToolTests(unittest.TestCase):
                        f"Last line doesn't contain correct line number: {lines[-1]}")
         
         # Check for line numbers in a more flexible way
-        if re.search(r'\d+\t', lines[0]):
-            line_number = re.search(r'(\d+)\t', lines[0]).group(1)
-            line_number = int(line_number)
+        line_number_match = LINE_NUMBER_RE.search(lines[0])
+        if line_number_match:
+            line_number = int(line_number_match.group(1))
             
             # Check that line number is in the expected range
             expected_min = test_data["inputs"]["offset"]
@@ -116,5 +119,35 @@ class ViewToolTests(unittest.TestCase):
                            f"Line number {line_number} outside expected range {expected_min}-{expected_max}")
 
 
+    def test_view_binary_file(self):
+        """Test that binary content is reported instead of being decoded as latin-1."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "data.txt")
+            with open(file_path, "wb") as f:
+                f.write(b"header\x00\x01\x02\xff" * 100)
+            
+            result = view_tool.forward(file_path=file_path)
+        
+        self.assertEqual(result, "This file contains binary content that cannot be displayed as text.")
+
+    @unittest.skipIf(os.name == "nt", "st_ctime is the creation time on Windows, so only the mtime shows a rewrite")
+    def test_view_rewritten_file(self):
+        """Test that a cached view is read again once the file changes, even with its mtime restored."""
+        caching_view_tool = ViewTool(cache_results=True)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "notes.py")
+            with open(file_path, "w") as f:
+                f.write("foo = 1\n")
+            self.assertIn("foo = 1", caching_view_tool.forward(file_path=file_path))
+            self.assertIn("foo = 1", caching_view_tool.forward(file_path=file_path))
+            
+            st = os.stat(file_path)
+            with open(file_path, "w") as f:
+                f.write("bar = 2\n")
+            os.utime(file_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+            self.assertIn("bar = 2", caching_view_tool.forward(file_path=file_path))
+        
+        self.assertFalse(view_tool.cache_results)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -5,10 +5,16 @@ This tool reads files from the local filesystem.
 It supports reading text files with optional line limiting and offsetting.
 """
 
+import codecs
 import os
+import threading
+import stat
 import mimetypes
 import base64
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice
+from typing import Optional, Dict, Any, Tuple
 from pathlib import Path
 
 from smolagents import Tool
@@ -18,6 +24,68 @@ MAX_LINES = 2000
 MAX_LINE_LENGTH = 2000
 TRUNCATED_LINE_SUFFIX = "... (line truncated)"
 TRUNCATED_FILE_MESSAGE = f"(Result truncated - total length: {{length}} characters)"
+ENCODINGS = ['utf-8', 'latin-1', 'cp1252']
+ENCODING_PROBE_BYTES = 65536
+VIEW_CACHE_SIZE = 128
+
+# C0 control bytes other than \t, \n, \v, \f and \r, which text files do not contain
+_CONTROL_BYTES = bytes(range(0, 9)) + bytes(range(14, 32))
+
+# (path, st_ino, st_size, st_mtime_ns, st_ctime_ns, start, limit) -> formatted view,
+# for ViewTools created with cache_results=True; least recently used entries go first
+_view_cache: "OrderedDict[Tuple[str, int, int, int, int, int, int], str]" = OrderedDict()
+_view_cache_lock = threading.Lock()
+
+
+def _looks_binary(head: bytes) -> bool:
+    """Check whether the first bytes of a file look like binary rather than text."""
+    if b'\x00' in head:
+        return True
+    control_chars = len(head) - len(head.translate(None, _CONTROL_BYTES))
+    return control_chars > 0.3 * len(head)
+
+
+@lru_cache(maxsize=1024)
+def _classify(file_path: str) -> Tuple[Optional[str], bool]:
+    """
+    Classify a file by its name.
+    
+    Args:
+        file_path: The absolute path of the file
+        
+    Returns:
+        The image mime type (None if the file is not an image) and whether it is a notebook
+    """
+    mime_type, _ = mimetypes.guess_type(file_path)
+    if not (mime_type and mime_type.startswith('image/')):
+        mime_type = None
+    return mime_type, file_path.lower().endswith('.ipynb')
+
+
+def _pick_encoding(file_path: str) -> Optional[str]:
+    """
+    Pick the first of ENCODINGS that can decode the start of a file.
+    
+    Args:
+        file_path: The file to probe
+        
+    Returns:
+        The encoding name, or None if the file looks binary or none of them fits
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(ENCODING_PROBE_BYTES)
+    # latin-1 decodes any bytes, so binary content has to be caught first
+    if _looks_binary(head):
+        return None
+    # A character cut off by the probe's end is not an error unless the file ends there
+    final = len(head) < ENCODING_PROBE_BYTES
+    for encoding in ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(head, final)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return None
 
 
 class ViewTool(Tool):
@@ -34,6 +102,19 @@ class ViewTool(Tool):
     }
     output_type = "string"
     
+    def __init__(self, cache_results: bool = False):
+        """
+        Initialize the ViewTool.
+        
+        Args:
+            cache_results: Whether to reuse the output for a file whose stat is
+                unchanged since it was last viewed, rather than reading it again.
+                Off by default: a rewrite within the file system's timestamp
+                resolution can leave the stat unchanged
+        """
+        super().__init__()
+        self.cache_results = cache_results
+    
     def forward(self, file_path: str, offset: Optional[int] = 0, limit: Optional[int] = None) -> str:
         """
         Read a file from the local filesystem.
@@ -50,19 +131,22 @@ class ViewTool(Tool):
         if not os.path.isabs(file_path):
             file_path = os.path.abspath(file_path)
             
-        # Check if file exists
-        if not os.path.exists(file_path):
+        # Check if file exists, with one stat call for both checks
+        try:
+            st = os.stat(file_path)
+        except (OSError, ValueError):
             return f"Error: File '{file_path}' does not exist"
-        if not os.path.isfile(file_path):
+        if not stat.S_ISREG(st.st_mode):
             return f"Error: Path '{file_path}' is not a file"
         
+        mime_type, is_notebook = _classify(file_path)
+        
         # Check if this is an image file
-        mime_type, _ = mimetypes.guess_type(file_path)
-        if mime_type and mime_type.startswith('image/'):
+        if mime_type:
             return self._handle_image_file(file_path, mime_type)
             
         # Handle Jupyter notebook files - suggest using ReadNotebook
-        if file_path.lower().endswith('.ipynb'):
+        if is_notebook:
             return f"This is a Jupyter notebook file. Please use the ReadNotebook tool instead to view it properly."
         
         # Setup limits
@@ -75,65 +159,71 @@ class ViewTool(Tool):
         # Ensure offset is valid
         offset = max(0, int(offset))  # Must be non-negative
         
+        # Lines before offset are skipped without being kept, and reading stops
+        # after the requested lines instead of loading the whole file
+        start = max(0, offset - 1)
+        
+        # ctime also changes when the mtime is set back after a rewrite
+        cache_key = None
+        if self.cache_results:
+            cache_key = (file_path, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns, start, limit)
+            with _view_cache_lock:
+                cached = _view_cache.get(cache_key)
+                if cached is not None:
+                    _view_cache.move_to_end(cache_key)
+                    return cached
+        
         try:
-            result = ""
-            total_length = 0
-            line_count = 0
-            displayed_lines = 0
             truncated = False
             
-            # Try different encodings if needed
-            encodings = ['utf-8', 'latin-1', 'cp1252']
+            # Start from the encoding that fits the start of the file, so a non-UTF-8
+            # file isn't read as UTF-8 first; later encodings remain the fallback
+            # for a decoding error further into the file
             file_content = None
+            first_encoding = _pick_encoding(file_path)
+            encodings = ENCODINGS[ENCODINGS.index(first_encoding):] if first_encoding else []
             
             for encoding in encodings:
                 try:
                     with open(file_path, 'r', encoding=encoding) as f:
-                        file_content = f.readlines()
+                        file_content = list(islice(f, start, start + max(0, limit)))
                     break
                 except UnicodeDecodeError:
                     continue
             
-            # If we couldn't read with any encoding, try as binary
+            # For binary files, show a message about binary content
             if file_content is None:
-                try:
-                    with open(file_path, 'rb') as f:
-                        # For binary files, show a message about binary content
-                        return "This file contains binary content that cannot be displayed as text."
-                except Exception as e:
-                    return f"Error reading file: {str(e)}"
+                return "This file contains binary content that cannot be displayed as text."
             
-            line_count = len(file_content)
-            # Prepare the formatted output with line numbers
-            for i, line in enumerate(file_content):
-                
-                # Skip lines before offset
-                if i < offset-1:
-                    continue
-                    
-                # Stop after limit lines
-                if displayed_lines >= limit:
-                    # truncated = True
-                    break
-                
-                # Truncate lines that are too long
-                if len(line) > MAX_LINE_LENGTH:
-                    line = line[:MAX_LINE_LENGTH] + TRUNCATED_LINE_SUFFIX
-                
-                # Add line with line number
-                # Use actual line number from the file, with offset considered
-                line_number = i + 1 # i is 0-indexed but we want to show 1-indexed line numbers
-                display_line = f"{line_number:6d}\t{line}"
-                result += display_line if display_line.endswith('\n') else display_line + '\n'
-                displayed_lines += 1
-                total_length += len(display_line)
+            # Truncate lines that are too long; a cut line loses its newline, so it gets one back
+            truncated_suffix = TRUNCATED_LINE_SUFFIX + "\n"
+            lines = [
+                line if len(line) <= MAX_LINE_LENGTH else line[:MAX_LINE_LENGTH] + truncated_suffix
+                for line in file_content
+            ]
+            
+            # Only the file's last line can now lack a newline
+            if lines and not lines[-1].endswith('\n'):
+                lines[-1] += '\n'
+            
+            # Prepare the formatted output with the file's 1-indexed line numbers
+            result = "".join([
+                "%6d\t%s" % (line_number, line)
+                for line_number, line in enumerate(lines, start + 1)
+            ])
             
             # Add a message if the file was truncated
             if truncated:
-                result += f"\n{TRUNCATED_FILE_MESSAGE.format(length=total_length)}\n"
+                result += f"\n{TRUNCATED_FILE_MESSAGE.format(length=len(result))}\n"
                 
             # Add line separator - deprecated
             # result += "\n" + "-" * 80 + "\n"
+            
+            if cache_key is not None:
+                with _view_cache_lock:
+                    _view_cache[cache_key] = result
+                    if len(_view_cache) > VIEW_CACHE_SIZE:
+                        _view_cache.popitem(last=False)
                 
             return result
             